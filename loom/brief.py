@@ -1,8 +1,9 @@
 """Structured brief loading for Loom."""
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 import tomllib
 
 
@@ -44,7 +45,7 @@ def load_brief(path: Path) -> Brief:
 
 
 def _load_toml_brief(path: Path) -> Brief:
-    data = tomllib.loads(path.read_text(encoding="utf-8"))
+    data = _parse_toml(path.read_bytes())
 
     return Brief(
         title=data.get("title", ""),
@@ -60,3 +61,8 @@ def _load_toml_brief(path: Path) -> Brief:
         rough_draft=data.get("rough_draft"),
     )
 
+
+@lru_cache(maxsize=32)
+def _parse_toml(raw: bytes) -> Dict[str, Any]:
+    """Parse TOML bytes, memoized on file content. Callers must not mutate the result."""
+    return tomllib.loads(raw.decode("utf-8"))
@@ -1,31 +1,55 @@
 """Rich CLI for human-in-the-loop Loom generation."""
 
 import argparse
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Optional
-
-import anthropic
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
+from typing import TYPE_CHECKING, Optional
 
 from loom.brief import Brief, load_brief
 from loom.core.config import BaseEngineConfig, SessionConfig
 from loom.core.models import Loom
-from loom.generators import make_generator
-from loom.io.manifest import append_decision_manifest
+from loom.generators import GeneratedCandidate, make_client, make_generator
+from loom.generators.pool import DaemonThreadPoolExecutor
+from loom.io.journal import JournalWriter
+from loom.io.manifest import ManifestWriter
 from loom.io.persistence import save_loom
 from loom.orchestrator import Orchestrator
 
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# Journal snapshot cadence, in committed choices: replay after a crash applies
+# at most this many records on top of the latest snapshot.
+JOURNAL_SNAPSHOT_EVERY = 20
+# Manifest records are flushed in groups of this many (and on exit). The
+# journal flushes every record, so a crash loses nothing it can't replay.
+MANIFEST_FLUSH_EVERY = 32
+
+# anthropic (httpx, pydantic) and rich are imported inside the functions that
+# use them (make_client, make_console, ...), so `--help` and argument errors
+# don't pay for them at startup.
+
 
 def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Loom CLI - human-in-the-loop text crafting")
+    parser = argparse.ArgumentParser(
+        description="Loom CLI - human-in-the-loop text crafting",
+        epilog=(
+            "journal.ndjson and manifest.ndjson in the output directory are appended as you "
+            "choose. loom.json is written whenever the session ends (s=stop, q=quit, Ctrl-D, "
+            "Ctrl-C or an error) and overwrites any loom.json already there."
+        ),
+    )
     parser.add_argument("-s", "--seed", required=True, help="Seed text to start the loom")
     parser.add_argument("-b", "--brief-path", help="Path to brief file (TOML or markdown)")
     parser.add_argument("--brief-text", help="Inline brief text (used as notes if no file)")
     parser.add_argument("-o", "--output-dir", default="loom_sessions", help="Output directory")
     parser.add_argument("-n", "--branching-factor", type=int, default=8, help="Number of candidates per step")
     parser.add_argument("-t", "--segment-tokens", type=int, default=6, help="Max tokens per candidate segment")
+    parser.add_argument(
+        "--speculate",
+        action="store_true",
+        help="Pre-generate the next step for the likeliest candidate while you choose (extra API calls)",
+    )
     return parser.parse_args(argv)
 
 
@@ -47,16 +71,30 @@ def create_session_config(args: argparse.Namespace) -> SessionConfig:
     return SessionConfig(base_engine=base_cfg)
 
 
-def save_session(loom: Loom, manifest_path: Path, event_id: Optional[str] = None) -> None:
-    output_dir = manifest_path.parent
-    output_dir.mkdir(parents=True, exist_ok=True)
+def save_session(loom: Loom, output_dir: Path) -> None:
+    """
+    Write loom.json when the session exits (however it exits).
+
+    Per-step changes are already in the journal and the manifest (both
+    appended by the orchestrator), so the full Loom is only rewritten once.
+    """
     save_loom(loom, output_dir / "loom.json")
-    if event_id:
-        event = loom.decision_events[event_id]
-        append_decision_manifest(manifest_path, event, session_id=loom.session_id)
 
 
-def render_candidates(console: Console, loom: Loom, event_id: str) -> None:
+def make_console() -> "Console":
+    from rich.console import Console
+
+    return Console()
+
+
+def render_arrival(console: "Console", candidate: GeneratedCandidate) -> None:
+    """Print a candidate as soon as its request finishes (the table follows)."""
+    console.print(candidate.text, style="dim", markup=False)
+
+
+def render_candidates(console: "Console", loom: Loom, event_id: str) -> None:
+    from rich.table import Table
+
     event = loom.decision_events[event_id]
     table = Table(title="Candidates", show_lines=True)
     table.add_column("#", justify="right")
@@ -72,47 +110,76 @@ def render_candidates(console: Console, loom: Loom, event_id: str) -> None:
 
 
 def main(argv: Optional[list[str]] = None) -> None:
-    console = Console()
     args = parse_args(argv)
+    console = make_console()
     brief = load_brief_from_args(args)
     session_cfg = create_session_config(args)
 
-    loom = Loom.create(seed_text=args.seed, brief=brief.notes or brief.title or "")
-    generator = make_generator(session_cfg.base_engine, anthropic.Anthropic())
-    orchestrator = Orchestrator(loom=loom, generator=generator, brief=brief, config=session_cfg)
+    from rich.panel import Panel
 
-    manifest_path = Path(args.output_dir) / "manifest.ndjson"
+    loom = Loom.create(seed_text=args.seed, brief=brief.notes or brief.title or "")
+    generator = make_generator(session_cfg.base_engine, make_client(session_cfg.base_engine))
+    output_dir = Path(args.output_dir)
 
     console.print(Panel(f"Session ID: {loom.session_id}\nSeed: {args.seed}", title="Loom Session"))
 
-    running = True
-    while running:
-        event = orchestrator.generate_step()
-        render_candidates(console, loom, event.id)
-
-        choice = console.input("Choose [number], s=stop, q=quit: ").strip().lower()
-
-        if choice == "q":
-            console.print("Quit without saving.")
-            return
-        if choice == "s":
-            orchestrator.commit_stop(event.id, "User stop")
-            save_session(loom, manifest_path, event_id=event.id)
-            console.print("Stopped.")
-            break
-
-        try:
-            idx = int(choice) - 1
-            if idx < 0 or idx >= len(event.candidate_node_ids):
-                raise ValueError
-        except ValueError:
-            console.print("[red]Invalid choice[/red]")
-            continue
-
-        chosen_id = event.candidate_node_ids[idx]
-        orchestrator.commit_choice(event.id, chosen_id, reason="human choice")
-        save_session(loom, manifest_path, event_id=event.id)
-        console.print(f"Chose candidate {idx+1}")
+    with ExitStack() as stack:
+        manifest = stack.enter_context(
+            ManifestWriter(output_dir / "manifest.ndjson", flush_every=MANIFEST_FLUSH_EVERY)
+        )
+        journal = stack.enter_context(JournalWriter(output_dir / "journal.ndjson"))
+        journal.snapshot(loom)
+        # Registered after the writers so it runs before they close, on any
+        # exit: stop, quit, Ctrl-C or an error.
+        stack.callback(save_session, loom, output_dir)
+        orchestrator = Orchestrator(
+            loom=loom,
+            generator=generator,
+            brief=brief,
+            config=session_cfg,
+            journal=journal,
+            manifest=manifest,
+        )
+        # Daemon threads, so quitting never waits on a speculative request.
+        # Two slots: a superseded speculation may still be finishing when the
+        # next one starts.
+        prefetch = DaemonThreadPoolExecutor(max_workers=2) if args.speculate else None
+
+        commits = 0
+        while True:
+            event = orchestrator.generate_step(
+                on_candidate=lambda cand: render_arrival(console, cand)
+            )
+            render_candidates(console, loom, event.id)
+            if prefetch is not None:
+                orchestrator.speculate(event, prefetch)
+
+            # Plain input(): the prompt has no markup for rich to render.
+            choice = input("Choose [number], s=stop, q=quit (both save): ").strip().lower()
+
+            if choice == "q":
+                # Leaves the open decision unresolved; loom.json is still saved.
+                console.print("Quit.")
+                break
+            if choice == "s":
+                orchestrator.commit_stop(event.id, "User stop")
+                console.print("Stopped.")
+                break
+
+            try:
+                idx = int(choice) - 1
+                if idx < 0 or idx >= len(event.candidate_node_ids):
+                    raise ValueError
+            except ValueError:
+                console.print("[red]Invalid choice[/red]")
+                continue
+
+            chosen_id = event.candidate_node_ids[idx]
+            orchestrator.commit_choice(event.id, chosen_id, reason="human choice")
+            commits += 1
+            if commits % JOURNAL_SNAPSHOT_EVERY == 0:
+                journal.snapshot(loom)
+            console.print(f"Chose candidate {idx+1}")
 
     console.print(f"Session saved to {args.output_dir}")
 
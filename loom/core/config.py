@@ -6,20 +6,23 @@ from typing import Optional
 from loom.core.models import new_id
 
 
-@dataclass
+@dataclass(slots=True)
 class BaseEngineConfig:
     """Configuration for the base text generation engine."""
 
-    engine_type: str = "claude_cli_sim"  # v0 default; future: "vllm", "together"
+    engine_type: str = "claude_cli_sim"  # v0 default; also "claude_batch"; future: "vllm", "together"
     model_name: str = "claude-3-5-sonnet-latest"
     segment_tokens: int = 6
     branching_factor: int = 8
     temperature: float = 1.0
     top_p: float = 1.0
     max_logprobs: int = 0  # v0 default — CLI-sim has no logprobs
+    max_concurrency: int = 8  # cap on in-flight API requests (rate limits)
+    single_call: bool = False  # CLI-sim: ask for all n candidates in one delimited response
+    batch_timeout: float = 3600.0  # claude_batch: seconds before an unfinished batch is cancelled
 
 
-@dataclass
+@dataclass(slots=True)
 class SelectorConfig:
     """Configuration for the selector (human, stateless LLM, or agentic LLM)."""
 
@@ -28,7 +31,7 @@ class SelectorConfig:
     show_logprobs: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionConfig:
     """Configuration for a complete Loom session."""
 
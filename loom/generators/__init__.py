@@ -1,8 +1,8 @@
 """Generator factory and exports."""
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from loom.generators.base import GeneratedCandidate, Generator
+from loom.generators.base import GeneratedCandidate, Generator, PromptContext
 from loom.generators.prompt import build_base_prompt
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -10,12 +10,42 @@ if TYPE_CHECKING:  # pragma: no cover
     from loom.core.config import BaseEngineConfig
 
 
+# Idle pooled connections are kept this long (seconds). httpx's 5 s default
+# expires them while the human reads candidates, so every step would pay for
+# fresh TLS handshakes.
+_KEEPALIVE_EXPIRY = 120.0
+
+
+def make_client(cfg: "BaseEngineConfig", **client_kwargs: Any) -> "anthropic.Anthropic":
+    """
+    Create the long-lived Anthropic client for a session.
+
+    One client (and HTTP pool) serves every step. The pool keeps at least
+    `max_concurrency` connections alive for `_KEEPALIVE_EXPIRY` seconds, so
+    each step's concurrent requests reuse warm connections. Extra keyword
+    arguments are passed to `anthropic.Anthropic`.
+    """
+    import anthropic
+
+    defaults = anthropic.DEFAULT_CONNECTION_LIMITS
+    limits = type(defaults)(  # the httpx Limits class anthropic is built on
+        max_connections=max(defaults.max_connections, cfg.max_concurrency),
+        max_keepalive_connections=max(defaults.max_keepalive_connections, cfg.max_concurrency),
+        keepalive_expiry=_KEEPALIVE_EXPIRY,
+    )
+    return anthropic.Anthropic(
+        http_client=anthropic.DefaultHttpxClient(limits=limits), **client_kwargs
+    )
+
+
 def make_generator(cfg: "BaseEngineConfig", client: "anthropic.Anthropic") -> Generator:
     """
     Factory to create a generator based on BaseEngineConfig.
 
-    Only Claude CLI-sim is supported in v0; others can be added later.
+    v0 supports Claude CLI-sim, either synchronous ("claude_cli_sim") or via the
+    Message Batches API ("claude_batch"); others can be added later.
     """
+    from loom.generators.claude_batch import ClaudeBatchGenerator
     from loom.generators.claude_cli_sim import ClaudeCLISimGenerator
 
     if cfg.engine_type == "claude_cli_sim":
@@ -24,6 +54,16 @@ def make_generator(cfg: "BaseEngineConfig", client: "anthropic.Anthropic") -> Ge
             model=cfg.model_name,
             temperature=cfg.temperature,
             top_p=cfg.top_p,
+            max_concurrency=cfg.max_concurrency,
+            single_call=cfg.single_call,
+        )
+    if cfg.engine_type == "claude_batch":
+        return ClaudeBatchGenerator(
+            client=client,
+            model=cfg.model_name,
+            temperature=cfg.temperature,
+            top_p=cfg.top_p,
+            timeout=cfg.batch_timeout,
         )
     raise ValueError(f"Unknown engine_type: {cfg.engine_type}")
 
@@ -31,6 +71,8 @@ def make_generator(cfg: "BaseEngineConfig", client: "anthropic.Anthropic") -> Ge
 __all__ = [
     "GeneratedCandidate",
     "Generator",
+    "PromptContext",
     "build_base_prompt",
+    "make_client",
     "make_generator",
 ]
@@ -1,10 +1,10 @@
 """Base generator protocol and candidate type."""
 
 from dataclasses import dataclass
-from typing import List, Optional, Protocol
+from typing import Iterator, List, Optional, Protocol
 
 
-@dataclass
+@dataclass(slots=True)
 class GeneratedCandidate:
     """Raw output from a generator. IDs are assigned when creating Nodes."""
 
@@ -14,8 +14,25 @@ class GeneratedCandidate:
     step_logprob: Optional[float]
 
 
+@dataclass(slots=True)
+class PromptContext:
+    """Prompt inputs for one path (the text so far plus brief sections)."""
+
+    full_text: str
+    fewshot_examples: str
+    section_intent: str
+    rough_draft: Optional[str]
+
+
 class Generator(Protocol):
-    """Interface for base text generators."""
+    """
+    Interface for base text generators.
+
+    Implementations may override generate_candidates_multi to share one round
+    trip (or one batch) across several paths; the default calls
+    generate_candidates once per context. iter_candidates may likewise yield
+    candidates as they finish; the default yields generate_candidates' list.
+    """
 
     def generate_candidates(
         self,
@@ -29,3 +46,43 @@ class Generator(Protocol):
     ) -> List[GeneratedCandidate]:
         ...
 
+    def iter_candidates(
+        self,
+        *,
+        full_text: str,
+        fewshot_examples: str,
+        section_intent: str,
+        rough_draft: Optional[str],
+        n: int,
+        max_tokens: int,
+    ) -> Iterator[GeneratedCandidate]:
+        """Yield up to `n` candidates, possibly in completion order."""
+        yield from self.generate_candidates(
+            full_text=full_text,
+            fewshot_examples=fewshot_examples,
+            section_intent=section_intent,
+            rough_draft=rough_draft,
+            n=n,
+            max_tokens=max_tokens,
+        )
+
+    def generate_candidates_multi(
+        self,
+        *,
+        contexts: List[PromptContext],
+        n: int,
+        max_tokens: int,
+    ) -> List[List[GeneratedCandidate]]:
+        """Generate `n` candidates for each context; results follow context order."""
+        return [
+            self.generate_candidates(
+                full_text=ctx.full_text,
+                fewshot_examples=ctx.fewshot_examples,
+                section_intent=ctx.section_intent,
+                rough_draft=ctx.rough_draft,
+                n=n,
+                max_tokens=max_tokens,
+            )
+            for ctx in contexts
+        ]
+
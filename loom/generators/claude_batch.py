@@ -0,0 +1,170 @@
+"""Claude CLI-sim generator backed by the Message Batches API."""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from loom.generators.base import GeneratedCandidate, PromptContext
+from loom.generators.claude_cli_sim import ClaudeCLISimGenerator
+
+
+@dataclass
+class ClaudeBatchGenerator(ClaudeCLISimGenerator):
+    """
+    Generate candidates by submitting one Message Batch per decision.
+
+    - Same prompt and CLI-sim framing as ClaudeCLISimGenerator.
+    - All `n` requests go out as a single batch (billed at the batch rate and
+      outside the synchronous rate limits), then results are polled for.
+    - Intended for non-interactive runs: batches can take minutes to end.
+      A batch still running after `timeout` seconds is cancelled and
+      TimeoutError is raised.
+    - If any request does not succeed (errored/canceled/expired), BatchError
+      is raised; it carries the texts that did succeed.
+    - generate_candidates_multi submits every path's requests in one batch.
+    - iter_candidates yields the batch's candidates after it ends, rather than
+      inheriting the synchronous per-request version.
+    - `single_call` is ignored: batch requests are already billed at a discount.
+    """
+
+    poll_interval: float = 5.0
+    timeout: float = 3600.0
+    sleep: Callable[[float], None] = time.sleep
+    clock: Callable[[], float] = time.monotonic
+
+    def generate_candidates(
+        self,
+        *,
+        full_text: str,
+        fewshot_examples: str,
+        section_intent: str,
+        rough_draft: Optional[str],
+        n: int,
+        max_tokens: int,
+    ) -> List[GeneratedCandidate]:
+        if n <= 0:
+            return []
+
+        params = self._message_params(
+            full_text=full_text,
+            fewshot_examples=fewshot_examples,
+            section_intent=section_intent,
+            rough_draft=rough_draft,
+            max_tokens=max_tokens,
+        )
+        requests = [{"custom_id": f"cand-{i}", "params": params} for i in range(n)]
+        texts = self._run_batch(requests)
+        return _succeeded(requests, texts)
+
+    def iter_candidates(
+        self,
+        *,
+        full_text: str,
+        fewshot_examples: str,
+        section_intent: str,
+        rough_draft: Optional[str],
+        n: int,
+        max_tokens: int,
+    ) -> Iterator[GeneratedCandidate]:
+        """Yield the batch's candidates once it ends (batches have no partial results)."""
+        yield from self.generate_candidates(
+            full_text=full_text,
+            fewshot_examples=fewshot_examples,
+            section_intent=section_intent,
+            rough_draft=rough_draft,
+            n=n,
+            max_tokens=max_tokens,
+        )
+
+    def generate_candidates_multi(
+        self,
+        *,
+        contexts: List[PromptContext],
+        n: int,
+        max_tokens: int,
+    ) -> List[List[GeneratedCandidate]]:
+        """Generate `n` candidates per context in a single batch (custom_id `path-{j}-cand-{i}`)."""
+        if n <= 0 or not contexts:
+            return [[] for _ in contexts]
+
+        per_path = []
+        for j, ctx in enumerate(contexts):
+            params = self._message_params(
+                full_text=ctx.full_text,
+                fewshot_examples=ctx.fewshot_examples,
+                section_intent=ctx.section_intent,
+                rough_draft=ctx.rough_draft,
+                max_tokens=max_tokens,
+            )
+            per_path.append(
+                [{"custom_id": f"path-{j}-cand-{i}", "params": params} for i in range(n)]
+            )
+        texts = self._run_batch([req for reqs in per_path for req in reqs])
+        return [_succeeded(reqs, texts) for reqs in per_path]
+
+    def _run_batch(self, requests: List[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        Submit a batch, wait for it to end, and return text keyed by custom_id.
+
+        Raises TimeoutError (after cancelling the batch) if it has not ended
+        within `timeout` seconds, and BatchError if any request did not succeed.
+        """
+        batches = self.client.messages.batches
+        batch = batches.create(requests=requests)
+        deadline = self.clock() + self.timeout
+        while batch.processing_status != "ended":
+            if self.clock() >= deadline:
+                batches.cancel(batch.id)
+                raise TimeoutError(
+                    f"Message batch {batch.id} did not end within {self.timeout:g}s; cancelled it."
+                )
+            self.sleep(self.poll_interval)
+            batch = batches.retrieve(batch.id)
+
+        texts: Dict[str, str] = {}
+        failures: Dict[str, str] = {}
+        for entry in batches.results(batch.id):
+            if entry.result.type == "succeeded":
+                texts[entry.custom_id] = entry.result.message.content[0].text
+            else:
+                failures[entry.custom_id] = entry.result.type
+        for req in requests:
+            cid = req["custom_id"]
+            if cid not in texts and cid not in failures:
+                failures[cid] = "missing"
+        if failures:
+            raise BatchError(batch.id, failures, texts)
+        return texts
+
+
+class BatchError(RuntimeError):
+    """
+    Some requests in a Message Batch did not succeed.
+
+    `failures` maps custom_id to the result type (errored/canceled/expired,
+    or "missing" if the batch returned no result for it); `texts` holds the
+    text of every request that did succeed, keyed by custom_id.
+    """
+
+    def __init__(self, batch_id: str, failures: Dict[str, str], texts: Dict[str, str]):
+        self.batch_id = batch_id
+        self.failures = failures
+        self.texts = texts
+        detail = ", ".join(f"{cid}: {kind}" for cid, kind in failures.items())
+        super().__init__(
+            f"{len(failures)} of {len(failures) + len(texts)} requests in batch "
+            f"{batch_id} did not succeed ({detail})"
+        )
+
+
+def _succeeded(requests: List[Dict[str, Any]], texts: Dict[str, str]) -> List[GeneratedCandidate]:
+    """Candidates for `requests`, in submission order."""
+    return [
+        GeneratedCandidate(
+            text=texts[req["custom_id"]],
+            token_ids=[],
+            token_logprobs=None,
+            step_logprob=None,
+        )
+        for req in requests
+    ]
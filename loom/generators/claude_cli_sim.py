@@ -1,30 +1,67 @@
 """Claude CLI-sim generator implementation."""
 
-from dataclasses import dataclass
-from typing import Any, List, Optional, TYPE_CHECKING
+import threading
+from concurrent.futures import as_completed
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
 
 from loom.brief import Brief
-from loom.generators.base import GeneratedCandidate, Generator
-from loom.generators.prompt import build_base_prompt
+from loom.generators.base import GeneratedCandidate, Generator, PromptContext
+from loom.generators.pool import DaemonThreadPoolExecutor
+from loom.generators.prompt import _HDR_CRAFTED, build_base_prompt_parts, split_candidates
 
 
 if TYPE_CHECKING:  # pragma: no cover
     import anthropic
 
 
+_SYSTEM_PROMPT = (
+    "You are in CLI simulation mode. "
+    "Respond only with the output of the requested command."
+)
+_COMMAND = "<cmd>cat draft.txt</cmd>\n\n"
+# Recently sent full texts kept for cache-block splitting (covers every
+# held path plus speculation).
+_MAX_SENT_TEXTS = 32
+
+
 @dataclass
 class ClaudeCLISimGenerator(Generator):
     """
     Generate candidates using Claude in CLI-simulation mode.
 
     - No logprobs are available; token_ids/logprobs remain empty/None.
+    - Prompt-cache breakpoints sit after the brief-derived prefix and after
+      the crafted text. The crafted text is sent as the same path's previous
+      request's blocks (the longest recently sent text it extends), unchanged,
+      plus one block for the new segment, so each step's prompt starts with
+      exactly the blocks the previous step cached.
     - Each call returns `n` independent short continuations.
+    - The Messages API has no multi-sample parameter, so the `n` requests are
+      issued concurrently on daemon threads (at most `max_concurrency` in
+      flight); wall time is ~1 round trip when n <= max_concurrency.
+      generate_candidates_multi puts every path's requests on the same pool;
+      iter_candidates yields each candidate as soon as its request returns.
+    - With `single_call=True`, one request per path asks for all `n`
+      continuations separated by a delimiter line (prompt billed once, but the
+      samples are no longer independent and may come back fewer than `n`).
     """
 
     client: Any
     model: str = "claude-3-5-sonnet-latest"
     temperature: float = 1.0
     top_p: float = 1.0
+    max_concurrency: int = 8
+    single_call: bool = False
+    # Recently sent full texts (insertion order, for eviction) mapped to the
+    # offsets where their crafted-text blocks ended, shared by every path and
+    # thread; a request that extends one reuses its blocks.
+    _sent_texts: Dict[str, Tuple[int, ...]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _sent_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
 
     def generate_candidates(
         self,
@@ -36,39 +73,196 @@ class ClaudeCLISimGenerator(Generator):
         n: int,
         max_tokens: int,
     ) -> List[GeneratedCandidate]:
-        brief = Brief(
+        context = PromptContext(
+            full_text=full_text,
             fewshot_examples=fewshot_examples,
             section_intent=section_intent,
             rough_draft=rough_draft,
         )
-        prompt = build_base_prompt(brief, full_text)
+        return self.generate_candidates_multi(contexts=[context], n=n, max_tokens=max_tokens)[0]
 
-        candidates: List[GeneratedCandidate] = []
-        for _ in range(n):
-            response = self.client.messages.create(
-                model=self.model,
+    def iter_candidates(
+        self,
+        *,
+        full_text: str,
+        fewshot_examples: str,
+        section_intent: str,
+        rough_draft: Optional[str],
+        n: int,
+        max_tokens: int,
+    ) -> Iterator[GeneratedCandidate]:
+        """Yield candidates in completion order (first one after ~1 round trip)."""
+        if self.single_call or n <= 1:
+            yield from self.generate_candidates(
+                full_text=full_text,
+                fewshot_examples=fewshot_examples,
+                section_intent=section_intent,
+                rough_draft=rough_draft,
+                n=n,
                 max_tokens=max_tokens,
-                temperature=self.temperature,
-                top_p=self.top_p,
-                system=(
-                    "You are in CLI simulation mode. "
-                    "Respond only with the output of the requested command."
-                ),
-                messages=[
-                    {
-                        "role": "user",
-                        "content": f"<cmd>cat draft.txt</cmd>\n\n{prompt}",
-                    }
-                ],
             )
-            text = response.content[0].text
-            candidates.append(
-                GeneratedCandidate(
-                    text=text,
-                    token_ids=[],
-                    token_logprobs=None,
-                    step_logprob=None,
+            return
+
+        params = self._message_params(
+            full_text=full_text,
+            fewshot_examples=fewshot_examples,
+            section_intent=section_intent,
+            rough_draft=rough_draft,
+            max_tokens=max_tokens,
+        )
+        create = self.client.messages.create
+        pool = DaemonThreadPoolExecutor(max_workers=max(1, min(n, self.max_concurrency)))
+        futures = [pool.submit(create, **params) for _ in range(n)]
+        try:
+            for future in as_completed(futures):
+                yield _candidate(future.result().content[0].text)
+        finally:
+            # Consumer stopped early (or a request failed): drop requests that
+            # haven't started, and don't wait for the ones in flight.
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def generate_candidates_multi(
+        self,
+        *,
+        contexts: List[PromptContext],
+        n: int,
+        max_tokens: int,
+    ) -> List[List[GeneratedCandidate]]:
+        """Generate `n` candidates per context, with all requests in flight at once."""
+        if n <= 0:
+            return [[] for _ in contexts]
+        if self.single_call and n > 1:
+            requests = [
+                self._message_params(
+                    full_text=ctx.full_text,
+                    fewshot_examples=ctx.fewshot_examples,
+                    section_intent=ctx.section_intent,
+                    rough_draft=ctx.rough_draft,
+                    max_tokens=n * max_tokens,
+                    n_continuations=n,
                 )
+                for ctx in contexts
+            ]
+            return [
+                [_candidate(text) for text in split_candidates(response.content[0].text, n)]
+                for response in self._create_all(requests)
+            ]
+
+        per_context = [
+            self._message_params(
+                full_text=ctx.full_text,
+                fewshot_examples=ctx.fewshot_examples,
+                section_intent=ctx.section_intent,
+                rough_draft=ctx.rough_draft,
+                max_tokens=max_tokens,
             )
+            for ctx in contexts
+        ]
+        requests = [params for params in per_context for _ in range(n)]
+        candidates = [
+            _candidate(response.content[0].text) for response in self._create_all(requests)
+        ]
+        return [candidates[i : i + n] for i in range(0, len(candidates), n)]
+
+    def _create_all(self, requests: List[Dict[str, Any]]) -> List[Any]:
+        """Issue `messages.create` for each params dict concurrently; keeps order."""
+        create = self.client.messages.create
+        if len(requests) <= 1:
+            return [create(**params) for params in requests]
+        workers = max(1, min(len(requests), self.max_concurrency))
+        # Daemon workers: a request still in flight (e.g. a speculative step)
+        # must not hold up interpreter exit.
+        with DaemonThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda params: create(**params), requests))
+
+    def _message_params(
+        self,
+        *,
+        full_text: str,
+        fewshot_examples: str,
+        section_intent: str,
+        rough_draft: Optional[str],
+        max_tokens: int,
+        n_continuations: int = 1,
+    ) -> Dict[str, Any]:
+        """Build the `messages.create` parameters shared by every candidate request."""
+        brief = Brief(
+            fewshot_examples=fewshot_examples,
+            section_intent=section_intent,
+            rough_draft=rough_draft,
+        )
+        prefix, tail = build_base_prompt_parts(brief, full_text, n_continuations)
+        content: List[Dict[str, Any]] = []
+        lead = _COMMAND
+        if prefix:
+            # The brief sections repeat on every step of a session.
+            content.append(_text_block(_COMMAND + prefix, cache=True))
+            lead = "\n\n"
+
+        # A path's crafted text only grows between steps. Repeating the
+        # previous request's blocks exactly (never re-merging them) and adding
+        # one for the new segment keeps that request's cached prefix intact; a
+        # new breakpoint after this text serves the next step. Only the new
+        # segment and CONTINUE are uncached.
+        if full_text:
+            start = 0
+            for offset in self._block_offsets(full_text):
+                end = len(_HDR_CRAFTED) + offset
+                content.append(_text_block(lead + tail[start:end]))
+                start, lead = end, ""
+            text_end = len(_HDR_CRAFTED) + len(full_text)
+            content.append(_text_block(lead + tail[start:text_end], cache=True))
+            content.append(_text_block(tail[text_end:]))
+        else:
+            content.append(_text_block(lead + tail))
+
+        return dict(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=self.temperature,
+            top_p=self.top_p,
+            system=_SYSTEM_PROMPT,
+            messages=[{"role": "user", "content": content}],
+        )
+
+    def _block_offsets(self, full_text: str) -> Tuple[int, ...]:
+        """
+        Return the offsets in `full_text` where its earlier crafted-text
+        blocks end, and record `full_text` as sent.
+
+        That is the block layout of the longest recently sent text that
+        `full_text` extends by a segment with non-whitespace content, plus
+        that text's end; () if there is none.
+        """
+        with self._sent_lock:
+            sent_texts = self._sent_texts
+            best = ""
+            for sent in sent_texts:
+                if (
+                    len(best) < len(sent) < len(full_text)
+                    and full_text.startswith(sent)
+                    and not full_text[len(sent):].isspace()
+                ):
+                    best = sent
+            offsets = sent_texts[best] + (len(best),) if best else ()
+            sent_texts.pop(full_text, None)
+            sent_texts[full_text] = offsets
+            if len(sent_texts) > _MAX_SENT_TEXTS:
+                del sent_texts[next(iter(sent_texts))]
+        return offsets
+
+
+def _text_block(text: str, cache: bool = False) -> Dict[str, Any]:
+    block: Dict[str, Any] = {"type": "text", "text": text}
+    if cache:
+        block["cache_control"] = {"type": "ephemeral"}
+    return block
+
 
-        return candidates
+def _candidate(text: str) -> GeneratedCandidate:
+    return GeneratedCandidate(
+        text=text,
+        token_ids=[],
+        token_logprobs=None,
+        step_logprob=None,
+    )
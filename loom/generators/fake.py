@@ -11,12 +11,15 @@ class FakeGenerator(Generator):
 
     Returns candidates like:
         candidate_0, candidate_1, ...
-    with empty token_ids and no logprobs (v0 normal case).
+    with empty token_ids and no logprobs (v0 normal case). Candidate texts are
+    formatted once and reused across calls.
     """
 
     def __init__(self, prefix: str = "candidate_", step_logprob: Optional[float] = None):
         self.prefix = prefix
         self.step_logprob = step_logprob
+        self._texts: List[str] = []
+        self._texts_prefix = prefix
 
     def generate_candidates(
         self,
@@ -28,13 +31,18 @@ class FakeGenerator(Generator):
         n: int,
         max_tokens: int,
     ) -> List[GeneratedCandidate]:
+        if self._texts_prefix != self.prefix:  # prefix was reassigned
+            self._texts, self._texts_prefix = [], self.prefix
+        texts = self._texts
+        if len(texts) < n:
+            texts.extend(f"{self.prefix}{i}" for i in range(len(texts), n))
         return [
             GeneratedCandidate(
-                text=f"{self.prefix}{i}",
+                text=text,
                 token_ids=[],
                 token_logprobs=None,
                 step_logprob=self.step_logprob,
             )
-            for i in range(n)
+            for text in texts[:n]
         ]
 
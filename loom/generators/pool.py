@@ -0,0 +1,66 @@
+"""Bounded executor that runs its tasks on daemon threads."""
+
+import threading
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Dict
+
+
+class DaemonThreadPoolExecutor(Executor):
+    """
+    Run tasks on daemon threads, at most `max_workers` at a time.
+
+    ThreadPoolExecutor workers are joined at interpreter exit, so a request
+    still in flight (e.g. a speculative step the human quit on) would delay
+    exiting until it returned. Daemon threads are abandoned instead.
+
+    Each task gets its own thread, which waits for a free slot before it
+    runs; tasks that are still waiting can be cancelled.
+    """
+
+    def __init__(self, max_workers: int):
+        if max_workers <= 0:
+            raise ValueError("max_workers must be greater than 0")
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._lock = threading.Lock()
+        self._pending: Dict[threading.Thread, Future] = {}
+        self._shutdown = False
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            thread = threading.Thread(
+                target=self._run, args=(future, fn, args, kwargs), daemon=True
+            )
+            self._pending[thread] = future
+            thread.start()
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self._lock:
+            self._shutdown = True
+            pending = dict(self._pending)
+        if cancel_futures:
+            for future in pending.values():
+                future.cancel()
+        if wait:
+            for thread in pending:
+                thread.join()
+
+    def _run(
+        self, future: Future, fn: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]
+    ) -> None:
+        try:
+            with self._slots:
+                if not future.set_running_or_notify_cancel():
+                    return
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as exc:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(result)
+        finally:
+            with self._lock:
+                self._pending.pop(threading.current_thread(), None)
@@ -1,7 +1,22 @@
 """Prompt construction helpers for base generation."""
 
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
 from loom.brief import Brief
 
+# Section headers (spec §5.1), each followed by its body on the next line.
+_HDR_FEWSHOT = "[FEW-SHOT TEXTURE EXAMPLES]\n"
+_HDR_INTENT = "[SECTION INTENT]\n"
+_HDR_ROUGH = "[ROUGH VERSION / OUTLINE]\n"
+_HDR_CRAFTED = "[CRAFTED TEXT SO FAR]\n"
+_CONTINUE = "\n\n[CONTINUE]"
+
+# Single-call mode: the model writes several continuations separated by this line.
+CANDIDATE_DELIMITER = "###CAND###"
+_DELIMITER_RE = re.compile(rf"\n?^{CANDIDATE_DELIMITER}[ \t]*$\n?", re.MULTILINE)
+
 
 def build_base_prompt(
     brief: Brief,
@@ -17,24 +32,64 @@ def build_base_prompt(
     - CRAFTED TEXT SO FAR
     - CONTINUE
     """
+    prefix, tail = build_base_prompt_parts(brief, full_text)
+    if prefix:
+        return f"{prefix}\n\n{tail}"
+    return tail
 
-    parts: list[str] = []
 
-    if brief.fewshot_examples.strip():
-        parts.append(_section("FEW-SHOT TEXTURE EXAMPLES", brief.fewshot_examples.strip()))
+def build_base_prompt_parts(
+    brief: Brief,
+    full_text: str,
+    n_continuations: int = 1,
+) -> Tuple[str, str]:
+    """
+    Build the base prompt split into (prefix, tail).
+
+    The prefix holds the brief-derived sections, which stay fixed for a
+    session and can be marked for prompt caching; it is "" when the brief has
+    none. The tail holds CRAFTED TEXT SO FAR and CONTINUE. Joining a non-empty
+    prefix and the tail with a blank line gives `build_base_prompt`.
 
-    if brief.section_intent.strip():
-        parts.append(_section("SECTION INTENT", brief.section_intent.strip()))
+    With n_continuations > 1 the CONTINUE line asks for that many
+    continuations separated by CANDIDATE_DELIMITER (see split_candidates).
+    """
+    prefix = _render_prefix(brief.fewshot_examples, brief.section_intent, brief.rough_draft)
+    if n_continuations > 1:
+        cont = (
+            f"\n\n[CONTINUE — produce {n_continuations} independent continuations "
+            f'separated by the line "{CANDIDATE_DELIMITER}"]'
+        )
+    else:
+        cont = _CONTINUE
+    return prefix, _HDR_CRAFTED + full_text + cont
+
+
+@lru_cache(maxsize=16)
+def _render_prefix(fewshot_examples: str, section_intent: str, rough_draft: Optional[str]) -> str:
+    """
+    Render the brief sections once per distinct brief.
+
+    The brief is fixed for a session, so every step after the first reuses
+    the rendered prefix instead of re-stripping and re-joining the few-shot blob.
+    """
+    parts: list[str] = []
 
-    if brief.rough_draft and brief.rough_draft.strip():
-        parts.append(_section("ROUGH VERSION / OUTLINE", brief.rough_draft.strip()))
+    fewshot = fewshot_examples.strip()
+    if fewshot:
+        parts.append(_HDR_FEWSHOT + fewshot)
 
-    parts.append(_section("CRAFTED TEXT SO FAR", full_text))
+    intent = section_intent.strip()
+    if intent:
+        parts.append(_HDR_INTENT + intent)
 
-    parts.append("[CONTINUE]")
+    rough = rough_draft.strip() if rough_draft else ""
+    if rough:
+        parts.append(_HDR_ROUGH + rough)
 
     return "\n\n".join(parts)
 
 
-def _section(title: str, body: str) -> str:
-    return f"[{title}]\n{body}"
+def split_candidates(text: str, n: int) -> List[str]:
+    """Split a single-call response into at most `n` non-empty continuations."""
+    return [chunk for chunk in _DELIMITER_RE.split(text) if chunk.strip()][:n]
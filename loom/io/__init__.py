@@ -1,10 +1,27 @@
 """IO utilities for Loom persistence and manifest logging."""
 
 from loom.io.persistence import save_loom, load_loom
-from loom.io.manifest import append_decision_manifest
+from loom.io.journal import JournalWriter, replay_journal
+from loom.io.manifest import (
+    ManifestWriter,
+    append_decision_manifest,
+    append_decision_manifest_batch,
+    clear_manifest_cache,
+    compress_manifest,
+    iter_manifest,
+    read_manifest,
+)
 
 __all__ = [
     "save_loom",
     "load_loom",
     "append_decision_manifest",
+    "append_decision_manifest_batch",
+    "ManifestWriter",
+    "read_manifest",
+    "iter_manifest",
+    "compress_manifest",
+    "clear_manifest_cache",
+    "JournalWriter",
+    "replay_journal",
 ]
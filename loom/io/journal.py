@@ -0,0 +1,98 @@
+"""Append-only NDJSON journal of Loom mutations."""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from loom.core.models import DecisionEvent, Loom, Node
+from loom.io.jsonutil import loads
+from loom.io.ndjson import NDJSONWriter
+
+
+class JournalWriter(NDJSONWriter):
+    """
+    Session-scoped append-only journal of Loom changes.
+
+    Each mutation appends one NDJSON record holding only what changed, so a
+    step costs O(candidates) bytes instead of rewriting the whole Loom:
+
+    - {"op": "snapshot", "loom": <Loom.to_dict()>}  full state (start, or periodic)
+    - {"op": "add", "event": ..., "nodes": [...]}     add_candidates
+    - {"op": "choose", "event": ..., "node": ...}     commit_choice (extends its path)
+    - {"op": "stop", "event": ...}                    commit_stop
+
+    replay_journal() rebuilds the Loom. Buffering, flushing and
+    fsync-on-close follow NDJSONWriter.
+    """
+
+    def snapshot(self, loom: Loom) -> None:
+        """Record the full Loom state; replay starts from the latest snapshot."""
+        self._write({"op": "snapshot", "loom": loom.to_dict()})
+
+    def record_add(self, event: DecisionEvent, nodes: List[Node]) -> None:
+        """Record a new decision event and its candidate nodes."""
+        self._write(
+            {"op": "add", "event": event.to_dict(), "nodes": [n.to_dict() for n in nodes]}
+        )
+
+    def record_choice(self, event: DecisionEvent, node: Node) -> None:
+        """Record a committed choice (resolved event and chosen node)."""
+        self._write({"op": "choose", "event": event.to_dict(), "node": node.to_dict()})
+
+    def record_stop(self, event: DecisionEvent) -> None:
+        """Record a committed stop."""
+        self._write({"op": "stop", "event": event.to_dict()})
+
+    def __enter__(self) -> "JournalWriter":
+        return self
+
+
+def replay_journal(path: Union[str, Path]) -> Loom:
+    """
+    Rebuild a Loom from a journal written by JournalWriter.
+
+    Starts from the latest snapshot and applies the records after it.
+
+    Args:
+        path: Path to the NDJSON journal file.
+
+    Returns:
+        The reconstructed Loom instance.
+
+    Raises:
+        ValueError: If the journal has no snapshot record.
+    """
+    state: Optional[Dict[str, Any]] = None
+    with Path(path).open("rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = loads(line)
+            op = record["op"]
+            if op == "snapshot":
+                state = record["loom"]
+                continue
+            if state is None:
+                raise ValueError(f"Journal {path} has no snapshot before {op!r} record")
+            event = record["event"]
+            state["decision_events"][event["id"]] = event
+            if op == "add":
+                for node in record["nodes"]:
+                    state["nodes"][node["id"]] = node
+            elif op == "choose":
+                node = record["node"]
+                state["nodes"][node["id"]] = node
+                _path_ending_at(state, node["parent_id"]).append(node["id"])
+    if state is None:
+        raise ValueError(f"Journal {path} has no snapshot record")
+    return Loom.from_dict(state)
+
+
+def _path_ending_at(state: Dict[str, Any], node_id: str) -> List[str]:
+    """Mirror Loom._path_ending_at on serialized state."""
+    current = state["current_path"]
+    if current and current[-1] == node_id:
+        return current
+    for path in state.get("held_paths", []):
+        if path and path[-1] == node_id:
+            return path
+    raise ValueError(f"Journal chooses a node whose parent {node_id} is no path's tip")
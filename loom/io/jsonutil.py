@@ -0,0 +1,51 @@
+"""
+JSON encode/decode helpers, using orjson when it is installed.
+
+Both backends produce the same documents: non-str dict keys (ints, floats,
+bools, None) become strings, and non-finite floats (NaN, +/-inf) are
+written as null, so files stay strict JSON that either backend can read.
+"""
+
+import json
+import math
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+# Built once: json.dumps() with non-default options constructs a new
+# JSONEncoder on every call.
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode
+_decode = json.JSONDecoder().decode
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode `obj` as compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    try:
+        return _encode(obj).encode("utf-8")
+    except ValueError:  # NaN/inf somewhere; match orjson and write null
+        return _encode(_finite(obj)).encode("utf-8")
+
+
+def loads(data: Union[bytes, memoryview, str]) -> Any:
+    """Decode JSON from bytes, a bytes-like buffer, or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if not isinstance(data, str):
+        data = str(data, "utf-8")
+    return _decode(data)
+
+
+def _finite(obj: Any) -> Any:
+    """Copy `obj` with non-finite floats replaced by None."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _finite(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(v) for v in obj]
+    return obj
@@ -1,11 +1,16 @@
 """NDJSON manifest logging for decision events."""
 
-import json
-from dataclasses import asdict
+import gzip
+import marshal
+import os
+import shutil
+from functools import lru_cache
 from pathlib import Path
-from typing import Union
+from typing import Any, Dict, Iterable, Iterator, Union
 
 from loom.core.models import DecisionEvent
+from loom.io.jsonutil import dumps, loads
+from loom.io.ndjson import NDJSONWriter
 
 
 def append_decision_manifest(
@@ -17,18 +22,69 @@ def append_decision_manifest(
     Append a decision event to an NDJSON manifest file.
 
     Each call appends one line containing the event data plus session metadata.
-    The manifest format matches §9 of loom_spec_v0.md.
+    The manifest format matches §9 of loom_spec_v0.md. The line goes out in
+    a single O_APPEND write, so concurrent appenders never interleave within
+    a record. For many events in one session, prefer ManifestWriter, which
+    keeps the file open.
 
     Args:
         path: Path to the NDJSON manifest file.
         event: The DecisionEvent to log.
         session_id: The session ID to include in the record.
     """
-    path = Path(path)
-    path.parent.mkdir(parents=True, exist_ok=True)
+    # 0o666 minus the umask for new files, the same as open(path, "a").
+    flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+    try:
+        fd = os.open(path, flags, 0o666)
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(os.fspath(path)), exist_ok=True)
+        fd = os.open(path, flags, 0o666)
+    try:
+        os.write(fd, dumps(_manifest_record(event, session_id)) + b"\n")
+    finally:
+        os.close(fd)
+
+
+def append_decision_manifest_batch(
+    path: Union[str, Path],
+    events: Iterable[DecisionEvent],
+    session_id: str,
+) -> None:
+    """
+    Append several decision events to an NDJSON manifest in one open/flush.
+
+    Args:
+        path: Path to the NDJSON manifest file.
+        events: The DecisionEvents to log, in order.
+        session_id: The session ID to include in each record.
+    """
+    with ManifestWriter(path) as writer:
+        writer.extend(events, session_id)
+
 
-    # Build the manifest record
-    record = {
+class ManifestWriter(NDJSONWriter):
+    """
+    Session-scoped NDJSON manifest writer.
+
+    Appends one line per resolved decision event; buffering, flushing and
+    fsync-on-close follow NDJSONWriter.
+    """
+
+    def append(self, event: DecisionEvent, session_id: str) -> None:
+        """Append one decision event record."""
+        self._write(_manifest_record(event, session_id))
+
+    def extend(self, events: Iterable[DecisionEvent], session_id: str) -> None:
+        """Append several event records, flushing once at the end."""
+        self._write_all(_manifest_record(event, session_id) for event in events)
+
+    def __enter__(self) -> "ManifestWriter":
+        return self
+
+
+def _manifest_record(event: DecisionEvent, session_id: str) -> Dict[str, Any]:
+    """Build the manifest record for one event."""
+    return {
         "session_id": session_id,
         "decision_id": event.id,
         "parent_node_id": event.parent_node_id,
@@ -43,29 +99,89 @@ def append_decision_manifest(
         "timestamp": event.timestamp,
     }
 
-    # Append as NDJSON (one JSON object per line)
-    with path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(record) + "\n")
-
 
 def read_manifest(path: Union[str, Path]) -> list[dict]:
     """
     Read all records from an NDJSON manifest file.
 
+    Parsed records are memoized on (path, mtime, size), so re-reading an
+    unchanged manifest in the same process skips the JSON parse; any append
+    changes the size and forces a fresh read. The memo holds a marshal blob,
+    so every call builds fresh records that callers may mutate freely.
+    clear_manifest_cache() drops the memo. Use iter_manifest() to stream
+    records without building the list.
+
     Args:
         path: Path to the NDJSON manifest file.
 
     Returns:
         List of decision records as dicts.
     """
-    path = Path(path)
-    if not path.exists():
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
         return []
+    return marshal.loads(_read_manifest_cached(os.fspath(path), st.st_mtime_ns, st.st_size))
+
 
-    records = []
-    with path.open("r", encoding="utf-8") as f:
+def clear_manifest_cache() -> None:
+    """Drop all manifests memoized by read_manifest()."""
+    _read_manifest_cached.cache_clear()
+
+
+@lru_cache(maxsize=4)
+def _read_manifest_cached(path: str, mtime_ns: int, size: int) -> bytes:
+    """
+    Parse a manifest into a marshal blob; the stat fields only key the cache.
+
+    Decoded JSON is only dicts, lists, str, numbers, bools and None, which
+    marshal round-trips; unmarshalling is faster than re-parsing the JSON.
+    """
+    return marshal.dumps(list(iter_manifest(path)))
+
+
+def iter_manifest(path: Union[str, Path]) -> Iterator[dict]:
+    """
+    Lazily yield records from an NDJSON manifest file.
+
+    Reads one line at a time, so memory stays flat for large manifests.
+    Paths ending in ".gz" (see compress_manifest) are decompressed on the fly.
+    Yields nothing if the file does not exist.
+
+    Args:
+        path: Path to the NDJSON manifest file.
+    """
+    try:
+        if os.fspath(path).endswith(".gz"):
+            f = gzip.open(path, "rb")
+        else:
+            f = open(path, "rb", buffering=ManifestWriter.BUFFER_SIZE)
+    except FileNotFoundError:
+        return
+    with f:
         for line in f:
-            line = line.strip()
-            if line:
-                records.append(json.loads(line))
-    return records
+            if line.strip():
+                yield loads(line)
+
+
+def compress_manifest(path: Union[str, Path]) -> Path:
+    """
+    Gzip a finished manifest to "<path>.gz" and remove the original.
+
+    The repetitive NDJSON schema compresses well, so long session logs are
+    cheaper to keep and to scan; read_manifest() and iter_manifest() accept
+    the compressed path directly. Only compress manifests no writer will
+    append to again.
+
+    Args:
+        path: Path to the NDJSON manifest file.
+
+    Returns:
+        Path to the compressed manifest.
+    """
+    path = Path(path)
+    gz_path = path.with_name(path.name + ".gz")
+    with path.open("rb") as src, gzip.open(gz_path, "wb") as dst:
+        shutil.copyfileobj(src, dst, ManifestWriter.BUFFER_SIZE)
+    path.unlink()
+    return gz_path
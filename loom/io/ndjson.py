@@ -0,0 +1,69 @@
+"""Shared append-only NDJSON file writer."""
+
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Optional, Union
+
+from loom.io.jsonutil import dumps
+
+
+class NDJSONWriter:
+    """
+    Session-scoped append-only NDJSON writer.
+
+    Opens the file once (creating parent directories on first use) and
+    appends one JSON record per line. Lines go through a 64 KiB buffer and
+    are flushed to the OS every `flush_every` records; close() also fsyncs,
+    so durability is per session rather than per line. Use as a context
+    manager or call close().
+    """
+
+    BUFFER_SIZE = 65536
+
+    def __init__(self, path: Union[str, Path], flush_every: int = 1):
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self._fh: Optional[BinaryIO] = None
+        self._pending = 0
+
+    def flush(self) -> None:
+        """Flush buffered lines to the OS."""
+        if self._fh is not None:
+            self._fh.flush()
+        self._pending = 0
+
+    def close(self) -> None:
+        """Flush, fsync and close the file. Safe to call more than once."""
+        fh, self._fh, self._pending = self._fh, None, 0
+        if fh is not None:
+            try:
+                fh.flush()
+                os.fsync(fh.fileno())
+            finally:
+                fh.close()
+
+    def __enter__(self) -> "NDJSONWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        """Append one record, flushing every `flush_every` records."""
+        self._file().write(dumps(record) + b"\n")
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def _write_all(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Append several records, flushing once at the end."""
+        write = self._file().write
+        for record in records:
+            write(dumps(record) + b"\n")
+        self.flush()
+
+    def _file(self) -> BinaryIO:
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = self.path.open("ab", buffering=self.BUFFER_SIZE)
+        return self._fh
@@ -1,37 +1,102 @@
 """JSON persistence for Loom sessions."""
 
-import json
+import mmap
+import os
 from pathlib import Path
-from typing import Union
+from typing import Any, Dict, Iterator, Union
 
 from loom.core.models import Loom
+from loom.io.jsonutil import dumps, loads
+
+_BUFFER_SIZE = 1 << 16
+
+# Top-level Loom fields written ahead of the (large) nodes/decision_events maps.
+_HEADER_FIELDS = (
+    "session_id",
+    "root_id",
+    "current_path",
+    "held_paths",
+    "brief",
+    "config",
+    "created_at",
+)
 
 
 def save_loom(loom: Loom, path: Union[str, Path]) -> None:
     """
     Save a Loom to a JSON file.
 
+    The document is streamed to disk one node/event at a time (one per line)
+    rather than materializing `loom.to_dict()` first. The result has the
+    same structure as `to_dict()` and loads with `load_loom` or `json.load`.
+
+    It is written to a temporary file beside `path` and then renamed over
+    it, so readers (including a memory-mapped load_loom) only ever see a
+    complete file, and a failed save leaves the previous one intact.
+
     Args:
         loom: The Loom instance to save.
         path: Path to the output JSON file.
     """
-    path = Path(path)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(loom.to_dict(), f, indent=2)
+    path = os.fspath(path)
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb", buffering=_BUFFER_SIZE) as f:
+            f.writelines(_iter_loom_json(loom))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
 
 
 def load_loom(path: Union[str, Path]) -> Loom:
     """
     Load a Loom from a JSON file.
 
+    The file is memory-mapped rather than read into a bytes object. With
+    orjson the mapping is parsed in place; the stdlib backend decodes it to a
+    str first, which copies the document once.
+
     Args:
         path: Path to the JSON file.
 
     Returns:
         The deserialized Loom instance.
     """
-    path = Path(path)
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file: mmap rejects zero length
+            data = loads(f.read())
+        else:
+            with mm, memoryview(mm) as view:
+                data = loads(view)
     return Loom.from_dict(data)
+
+
+def _iter_loom_json(loom: Loom) -> Iterator[bytes]:
+    """Yield the UTF-8 JSON encoding of a Loom in small chunks."""
+    yield b"{\n"
+    for name in _HEADER_FIELDS:
+        yield b"  " + dumps(name) + b": " + dumps(getattr(loom, name)) + b",\n"
+    yield from _iter_json_map("nodes", loom.nodes)
+    yield b",\n"
+    yield from _iter_json_map("decision_events", loom.decision_events)
+    yield b"\n}\n"
+
+
+def _iter_json_map(name: str, items: Dict[str, Any]) -> Iterator[bytes]:
+    yield b"  " + dumps(name) + b": {"
+    sep = b"\n"
+    for key, value in items.items():
+        yield sep + b"    " + dumps(key) + b": " + dumps(value.to_dict())
+        sep = b",\n"
+    yield b"\n  }"
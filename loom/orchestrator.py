@@ -1,11 +1,15 @@
 """Orchestrator tying Loom, Brief, and Generator together."""
 
-from typing import Optional
+import asyncio
+from concurrent.futures import Executor, Future
+from typing import Callable, Iterator, List, Optional, Tuple
 
 from loom.brief import Brief
 from loom.core.config import SessionConfig
 from loom.core.models import DecisionEvent, Loom, Node
-from loom.generators.base import Generator
+from loom.generators.base import GeneratedCandidate, Generator, PromptContext
+from loom.io.journal import JournalWriter
+from loom.io.manifest import ManifestWriter
 
 
 class Orchestrator:
@@ -16,57 +20,252 @@ class Orchestrator:
     - Call the generator with prompt components (brief + current text).
     - Create candidate Nodes and DecisionEvents on the Loom.
     - Commit human choices or stops.
+    - Optionally extend every held path in the same generator call.
+    - Optionally append each change to a JournalWriter and each resolved
+      decision to a ManifestWriter.
+    - Optionally hand each candidate to a callback as it arrives.
+    - Optionally speculate: generate the next step for the likeliest choice
+      in the background while the human decides.
     """
 
-    def __init__(self, loom: Loom, generator: Generator, brief: Brief, config: SessionConfig):
+    def __init__(
+        self,
+        loom: Loom,
+        generator: Generator,
+        brief: Brief,
+        config: SessionConfig,
+        journal: Optional[JournalWriter] = None,
+        manifest: Optional[ManifestWriter] = None,
+    ):
         self.loom = loom
         self.generator = generator
         self.brief = brief
         self.config = config
+        self.journal = journal
+        self.manifest = manifest
+        # (node_id, pending candidates) for a speculative next step, if any
+        self._speculation: Optional[Tuple[str, "Future[List[GeneratedCandidate]]"]] = None
 
-    def generate_step(self) -> DecisionEvent:
+    def generate_step(
+        self, on_candidate: Optional[Callable[[GeneratedCandidate], None]] = None
+    ) -> DecisionEvent:
         """
         Generate candidates from the current tip and return an unresolved DecisionEvent.
+
+        If a speculation was started for the node that is now the tip, its
+        candidates are used instead of calling the generator again (unless
+        that speculative call failed).
+
+        With `on_candidate`, candidates come from the generator's
+        iter_candidates and each is passed to the callback as it arrives
+        (so a front end can show the first ones early).
         """
         tip = self.loom.get_tip()
         if tip is None:
             raise ValueError("Loom has no tip to generate from.")
 
-        n = self.config.base_engine.branching_factor
-        max_tokens = self.config.base_engine.segment_tokens
+        raw_candidates = self._speculated_candidates(tip.id)
+        if raw_candidates is None:
+            if on_candidate is None:
+                raw_candidates = self._generate(self.loom.get_current_text())
+            else:
+                raw_candidates = []
+                for cand in self._iter_generate(self.loom.get_current_text()):
+                    on_candidate(cand)
+                    raw_candidates.append(cand)
+        elif on_candidate is not None:
+            for cand in raw_candidates:
+                on_candidate(cand)
 
-        raw_candidates = self.generator.generate_candidates(
-            full_text=tip.full_text,
-            fewshot_examples=self.brief.fewshot_examples,
-            section_intent=self.brief.section_intent,
-            rough_draft=self.brief.rough_draft,
-            n=n,
-            max_tokens=max_tokens,
+        return self._add_candidates(tip, raw_candidates)
+
+    def generate_steps(self) -> List[DecisionEvent]:
+        """
+        Generate candidates for the current tip and each held path's tip.
+
+        All tips share one generate_candidates_multi call, so held paths are
+        explored at about the cost of one round trip (or one batch). Returns
+        one unresolved DecisionEvent per distinct tip, current path first.
+        """
+        tip = self.loom.get_tip()
+        if tip is None:
+            raise ValueError("Loom has no tip to generate from.")
+
+        tip_ids = [tip.id]
+        for path in self.loom.held_paths:
+            if path and path[-1] not in tip_ids:
+                tip_ids.append(path[-1])
+
+        speculated = self._speculated_candidates(tip.id)
+        pending = tip_ids[1:] if speculated is not None else tip_ids
+        generated = self.generator.generate_candidates_multi(
+            contexts=[self._context(self.loom.get_full_text(nid)) for nid in pending],
+            n=self.config.base_engine.branching_factor,
+            max_tokens=self.config.base_engine.segment_tokens,
         )
+        if speculated is not None:
+            generated.insert(0, speculated)
 
-        nodes = [
-            Node.from_candidate(
-                parent=tip,
-                text=cand.text,
-                token_ids=cand.token_ids,
-                token_logprobs=cand.token_logprobs,
-                step_logprob=cand.step_logprob,
-            )
-            for cand in raw_candidates
+        return [
+            self._add_candidates(self.loom.nodes[nid], raw)
+            for nid, raw in zip(tip_ids, generated)
         ]
 
-        event = self.loom.add_candidates(tip.id, nodes)
-        return event
+    def speculate(self, event: DecisionEvent, executor: Executor) -> Optional[str]:
+        """
+        Start generating the step after `event` on `executor`, betting on its
+        likeliest candidate (highest step_logprob, else the first one).
+
+        Returns the node ID speculated on (None if the event has no candidates).
+        The result is used by the next generate_step only if that node was
+        chosen; otherwise it is discarded. If the speculative call fails, the
+        next step calls the generator again instead.
+        """
+        self.discard_speculation()
+        if not event.candidate_node_ids:
+            return None
+        node_id = _likeliest_candidate(self.loom, event)
+        full_text = self.loom.get_full_text(node_id)
+        self._speculation = (node_id, executor.submit(self._generate, full_text))
+        return node_id
+
+    def discard_speculation(self) -> None:
+        """Drop any pending speculation (cancelling it if it has not started)."""
+        if self._speculation is not None:
+            self._speculation[1].cancel()
+            self._speculation = None
 
     def commit_choice(self, event_id: str, node_id: str, reason: str) -> None:
         """
-        Commit a human choice and extend the current path.
+        Commit a human choice, extending the current path or, for an event
+        from generate_steps() on a held path's tip, that held path.
         """
         self.loom.commit_choice(event_id, node_id, chosen_by="human", reason=reason)
+        event = self.loom.decision_events[event_id]
+        if self.journal is not None:
+            self.journal.record_choice(event, self.loom.nodes[node_id])
+        if self.manifest is not None:
+            self.manifest.append(event, self.loom.session_id)
 
     def commit_stop(self, event_id: str, reason: str) -> None:
         """
         Commit a stop action without extending the path.
         """
+        self.discard_speculation()
         self.loom.commit_stop(event_id, reason)
+        event = self.loom.decision_events[event_id]
+        if self.journal is not None:
+            self.journal.record_stop(event)
+        if self.manifest is not None:
+            self.manifest.append(event, self.loom.session_id)
+
+    def _add_candidates(
+        self, parent: Node, raw_candidates: List[GeneratedCandidate]
+    ) -> DecisionEvent:
+        from_candidate = Node.from_candidate
+        nodes = [
+            from_candidate(
+                parent=parent,
+                text=cand.text,
+                token_ids=cand.token_ids,
+                token_logprobs=cand.token_logprobs,
+                step_logprob=cand.step_logprob,
+            )
+            for cand in raw_candidates
+        ]
+        event = self.loom.add_candidates(parent.id, nodes)
+        if self.journal is not None:
+            self.journal.record_add(event, nodes)
+        return event
+
+    def _context(self, full_text: str) -> PromptContext:
+        return PromptContext(
+            full_text=full_text,
+            fewshot_examples=self.brief.fewshot_examples,
+            section_intent=self.brief.section_intent,
+            rough_draft=self.brief.rough_draft,
+        )
+
+    def _generate(self, full_text: str) -> List[GeneratedCandidate]:
+        return self.generator.generate_candidates(
+            full_text=full_text,
+            fewshot_examples=self.brief.fewshot_examples,
+            section_intent=self.brief.section_intent,
+            rough_draft=self.brief.rough_draft,
+            n=self.config.base_engine.branching_factor,
+            max_tokens=self.config.base_engine.segment_tokens,
+        )
+
+    def _iter_generate(self, full_text: str) -> Iterator[GeneratedCandidate]:
+        return self.generator.iter_candidates(
+            full_text=full_text,
+            fewshot_examples=self.brief.fewshot_examples,
+            section_intent=self.brief.section_intent,
+            rough_draft=self.brief.rough_draft,
+            n=self.config.base_engine.branching_factor,
+            max_tokens=self.config.base_engine.segment_tokens,
+        )
+
+    def _speculated_candidates(self, node_id: str) -> Optional[List[GeneratedCandidate]]:
+        """Candidates from the speculation for `node_id`; None if there was none or it failed."""
+        speculation = self._take_speculation(node_id)
+        if speculation is None:
+            return None
+        try:
+            return speculation.result()
+        except Exception:
+            # The pre-fetch was optional; a rate limit or timeout on it must not
+            # fail the real step.
+            return None
+
+    def _take_speculation(self, node_id: str) -> Optional["Future[List[GeneratedCandidate]]"]:
+        """Pop the pending speculation; return its future only if it was for `node_id`."""
+        speculation, self._speculation = self._speculation, None
+        if speculation is None:
+            return None
+        spec_node_id, future = speculation
+        if spec_node_id != node_id:
+            future.cancel()
+            return None
+        return future
+
+
+class AsyncOrchestrator(Orchestrator):
+    """
+    Orchestrator with an awaitable generate step, for asyncio front ends.
+
+    The blocking generator call runs in a worker thread (asyncio.to_thread),
+    so other tasks on the event loop (a selector, UI refresh, preparing the
+    next context) keep running while candidates are generated. Loom mutations
+    stay on the event-loop thread; commits are in-memory and remain sync.
+    """
+
+    async def generate_step_async(self) -> DecisionEvent:
+        """Awaitable generate_step (same speculation reuse and journaling)."""
+        tip = self.loom.get_tip()
+        if tip is None:
+            raise ValueError("Loom has no tip to generate from.")
+
+        raw_candidates = None
+        speculation = self._take_speculation(tip.id)
+        if speculation is not None:
+            try:
+                raw_candidates = await asyncio.wrap_future(speculation)
+            except Exception:
+                raw_candidates = None  # optional pre-fetch failed; generate afresh
+        if raw_candidates is None:
+            raw_candidates = await asyncio.to_thread(
+                self._generate, self.loom.get_current_text()
+            )
+
+        return self._add_candidates(tip, raw_candidates)
+
 
+def _likeliest_candidate(loom: Loom, event: DecisionEvent) -> str:
+    best_id = event.candidate_node_ids[0]
+    best_lp = loom.nodes[best_id].step_logprob
+    for nid in event.candidate_node_ids[1:]:
+        lp = loom.nodes[nid].step_logprob
+        if lp is not None and (best_lp is None or lp > best_lp):
+            best_id, best_lp = nid, lp
+    return best_id
@@ -18,6 +18,8 @@ class TestBaseEngineConfig:
         assert cfg.temperature == 1.0
         assert cfg.top_p == 1.0
         assert cfg.max_logprobs == 0  # v0: no logprobs
+        assert cfg.max_concurrency == 8
+        assert cfg.single_call is False
 
     def test_custom_values(self):
         cfg = BaseEngineConfig(
@@ -61,6 +63,11 @@ class TestSelectorConfig:
 class TestSessionConfig:
     """Tests for SessionConfig."""
 
+    def test_configs_use_slots(self):
+        cfg = SessionConfig()
+        for obj in (cfg, cfg.base_engine, cfg.selector):
+            assert not hasattr(obj, "__dict__")
+
     def test_defaults(self):
         cfg = SessionConfig()
         assert isinstance(cfg.id, str)
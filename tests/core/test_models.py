@@ -1,5 +1,8 @@
 """Tests for loom.core.models: Node, DecisionEvent, Loom."""
 
+from dataclasses import asdict
+import os
+
 import pytest
 
 from loom.core.models import Node, DecisionEvent, Loom, new_id
@@ -18,17 +21,44 @@ class TestNewId:
         ids = [new_id() for _ in range(100)]
         assert len(set(ids)) == 100
 
+    def test_is_hex(self):
+        int(new_id(), 16)
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_forked_child_does_not_repeat_parent_ids(self):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # child
+            try:
+                os.write(write_fd, " ".join(new_id() for _ in range(5)).encode())
+            finally:
+                os._exit(0)
+        os.close(write_fd)
+        parent_ids = {new_id() for _ in range(5)}
+        with os.fdopen(read_fd, "rb") as f:
+            child_ids = set(f.read().decode().split())
+        os.waitpid(pid, 0)
+
+        assert len(child_ids) == 5
+        assert not parent_ids & child_ids
+
 
 class TestNode:
     """Tests for the Node dataclass."""
 
+    def test_positional_fields_keep_their_order(self):
+        node = Node("n1", None, "text", [1], [-0.5], -0.5)
+
+        assert node.token_logprobs.tolist() == [-0.5]
+        assert node.step_logprob == -0.5
+        assert node.depth == 0
+
     def test_create_root_sets_defaults(self):
         node = Node.create_root("Hello")
         assert node.text == "Hello"
-        assert node.full_text == "Hello"
         assert node.parent_id is None
         assert node.was_chosen is True
-        assert node.token_ids == []
+        assert node.token_ids.tolist() == []
         assert node.token_logprobs is None
         assert node.step_logprob is None
         assert node.decision_id is None
@@ -48,8 +78,9 @@ class TestNode:
         )
         assert child.parent_id == root.id
         assert child.text == "quick"
-        assert child.full_text == "The quick"
-        assert child.token_ids == [1, 2, 3]
+        assert root.depth == 0
+        assert child.depth == 1
+        assert child.token_ids.tolist() == [1, 2, 3]
         assert child.was_chosen is False
         assert child.token_logprobs is None
         assert child.step_logprob is None
@@ -63,9 +94,48 @@ class TestNode:
             token_logprobs=[-1.5, -2.0],
             step_logprob=-3.5,
         )
-        assert child.token_logprobs == [-1.5, -2.0]
+        assert child.token_logprobs.tolist() == [-1.5, -2.0]
+        assert child.step_logprob == -3.5
+
+    def test_tokens_stored_as_packed_arrays(self):
+        root = Node.create_root("The ")
+        child = Node.from_candidate(root, "fox", [10, 20], token_logprobs=[-1.5, -2.0])
+        assert child.token_ids.typecode == "i"
+        assert child.token_logprobs.typecode == "d"
+
+    def test_step_logprob_derived_from_token_logprobs(self):
+        root = Node.create_root("The ")
+        child = Node.from_candidate(root, "fox", [10, 20], token_logprobs=[-1.5, -2.0])
         assert child.step_logprob == -3.5
 
+    def test_compute_full_text_walks_parent_chain(self):
+        root = Node.create_root("The ")
+        child = Node.from_candidate(root, "quick ", [])
+        grandchild = Node.from_candidate(child, "fox", [])
+        nodes = {n.id: n for n in (root, child, grandchild)}
+
+        assert grandchild.compute_full_text(nodes) == "The quick fox"
+        assert root.compute_full_text(nodes) == "The "
+        # Missing ancestors end the walk instead of raising
+        assert grandchild.compute_full_text({grandchild.id: grandchild}) == "fox"
+
+    def test_uses_slots(self):
+        node = Node.create_root("seed")
+        assert not hasattr(node, "__dict__")
+        with pytest.raises(AttributeError):
+            node.not_a_field = 1
+
+    def test_identity_equality_and_hashable(self):
+        node = Node.create_root("seed")
+        twin = Node.from_dict(node.to_dict())
+        assert node == node
+        assert node != twin
+        assert len({node, twin, node}) == 2
+
+        event = DecisionEvent.create(node.id, [])
+        assert event != DecisionEvent.from_dict(event.to_dict())
+        assert {event: 1}[event] == 1
+
     def test_logprob_fields_default_to_none(self):
         """v0 normal case: logprobs are None."""
         root = Node.create_root("seed")
@@ -139,6 +209,22 @@ class TestDecisionEvent:
         assert event.chosen_logprob == -2.0  # node_a
         assert event.logprob_gap == -1.0  # -2.0 - (-1.0) = -1.0 (override)
 
+    def test_resolve_choose_skips_missing_logprobs(self):
+        """Candidates without step_logprob are ignored when finding the max."""
+        event = DecisionEvent.create("parent", ["a", "b", "c"])
+        node_a = Node.create_root("a")
+        node_a.step_logprob = -2.0
+        node_b = Node.create_root("b")  # no logprob
+        node_c = Node.create_root("c")
+        node_c.step_logprob = -2.5
+        nodes = {"a": node_a, "b": node_b, "c": node_c}
+
+        event.resolve_choose("a", "selector_llm", "best", nodes=nodes)
+
+        assert event.max_logprob == -2.0
+        assert event.chosen_logprob == -2.0
+        assert event.logprob_gap == 0.0
+
     def test_resolve_choose_with_candidate_scores(self):
         event = DecisionEvent.create("parent", ["a", "b"])
         scores = {
@@ -177,6 +263,10 @@ class TestDecisionEvent:
 class TestLoom:
     """Tests for the Loom dataclass."""
 
+    def test_uses_slots(self):
+        loom = Loom.create("seed", brief="")
+        assert not hasattr(loom, "__dict__")
+
     def test_create_initializes_with_root(self):
         loom = Loom.create("The beginning", brief="Test brief")
         assert loom.brief == "Test brief"
@@ -185,7 +275,6 @@ class TestLoom:
         assert len(loom.nodes) == 1
         root = loom.nodes[loom.root_id]
         assert root.text == "The beginning"
-        assert root.full_text == "The beginning"
         assert root.was_chosen is True
         assert root.parent_id is None
 
@@ -198,6 +287,24 @@ class TestLoom:
         loom = Loom.create("Hello", brief="")
         assert loom.get_current_text() == "Hello"
 
+    def test_get_full_text_walks_parents(self):
+        loom = Loom.create("The ", brief="")
+        root = loom.get_tip()
+        candidates = [
+            Node.from_candidate(root, "quick", []),
+            Node.from_candidate(root, "slow", []),
+        ]
+        event = loom.add_candidates(root.id, candidates)
+        loom.commit_choice(event.id, candidates[0].id, "human", "ok")
+        tip = loom.get_tip()
+        grandchild = Node.from_candidate(tip, " fox", [])
+        loom.add_candidates(tip.id, [grandchild])
+
+        assert loom.get_full_text(root.id) == "The "
+        assert loom.get_full_text(candidates[1].id) == "The slow"
+        assert loom.get_full_text(grandchild.id) == "The quick fox"
+        assert loom.get_full_text("missing") == ""
+
     def test_get_tip(self):
         loom = Loom.create("Hello", brief="")
         tip = loom.get_tip()
@@ -212,6 +319,29 @@ class TestLoom:
         loom = Loom()
         assert loom.get_current_text() == ""
 
+    def test_get_current_text_cached_across_choices(self):
+        loom = Loom.create("The ", brief="")
+        assert loom.get_current_text() == "The "
+        for word in ("quick ", "fox"):
+            tip = loom.get_tip()
+            candidates = [Node.from_candidate(tip, word, []), Node.from_candidate(tip, "x", [])]
+            event = loom.add_candidates(tip.id, candidates)
+            loom.commit_choice(event.id, candidates[0].id, "human", "ok")
+            assert loom._current_text_cache[0] == candidates[0].id
+        assert loom.get_current_text() is loom.get_current_text()
+        assert loom.get_current_text() == "The quick fox"
+
+    def test_get_current_text_follows_replaced_path(self):
+        loom = Loom.create("The ", brief="")
+        root = loom.get_tip()
+        candidates = [Node.from_candidate(root, "a", []), Node.from_candidate(root, "b", [])]
+        event = loom.add_candidates(root.id, candidates)
+        loom.commit_choice(event.id, candidates[0].id, "human", "ok")
+        assert loom.get_current_text() == "The a"
+
+        loom.current_path = [root.id, candidates[1].id]
+        assert loom.get_current_text() == "The b"
+
     def test_add_candidates_creates_nodes_and_event(self):
         loom = Loom.create("The ", brief="")
         root = loom.get_tip()
@@ -262,6 +392,36 @@ class TestLoom:
         assert event.action == "choose"
         assert event.chosen_node_id == chosen_id
 
+    def test_commit_choice_rejects_event_off_every_path(self):
+        loom = Loom.create("The ", brief="")
+        root = loom.get_tip()
+        a, b = Node.from_candidate(root, "a", []), Node.from_candidate(root, "b", [])
+        first = loom.add_candidates(root.id, [a, b])
+        loom.commit_choice(first.id, a.id, "human", "ok")
+        stale = loom.add_candidates(b.id, [Node.from_candidate(b, "x", [])])
+
+        with pytest.raises(ValueError):
+            loom.commit_choice(stale.id, stale.candidate_node_ids[0], "human", "ok")
+
+        assert loom.current_path == [root.id, a.id]
+        assert stale.action == ""
+
+    def test_commit_choice_extends_matching_held_path(self):
+        loom = Loom.create("The ", brief="")
+        root = loom.get_tip()
+        a, b = Node.from_candidate(root, "a", []), Node.from_candidate(root, "b", [])
+        first = loom.add_candidates(root.id, [a, b])
+        loom.commit_choice(first.id, a.id, "human", "ok")
+        loom.held_paths.append([root.id, b.id])
+        x = Node.from_candidate(b, "x", [])
+        held_event = loom.add_candidates(b.id, [x])
+
+        loom.commit_choice(held_event.id, x.id, "human", "ok")
+
+        assert loom.current_path == [root.id, a.id]
+        assert loom.get_current_text() == "The a"
+        assert loom.held_paths == [[root.id, b.id, x.id]]
+
     def test_commit_stop_does_not_extend_path(self):
         loom = Loom.create("The end", brief="")
         root = loom.get_tip()
@@ -316,6 +476,25 @@ class TestLoom:
         # Most recent first
         assert last_2[0].timestamp >= last_2[1].timestamp
 
+    def test_get_last_n_decisions_uses_insertion_order(self):
+        """Events created within the same clock tick still come back newest first."""
+        loom = Loom.create("The ", brief="")
+        events = []
+        for word in ["quick ", "brown ", "fox"]:
+            tip = loom.get_tip()
+            candidates = [Node.from_candidate(tip, word, [])]
+            event = loom.add_candidates(tip.id, candidates)
+            event.timestamp = 100.0
+            loom.commit_choice(event.id, candidates[0].id, "human", "ok")
+            events.append(event)
+
+        assert loom.get_last_n_decisions(2) == [events[2], events[1]]
+        assert loom.get_last_n_decisions(10) == events[::-1]
+        assert loom.get_last_n_decisions(0) == []
+
+        restored = Loom.from_dict(loom.to_dict())
+        assert [e.id for e in restored.get_last_n_decisions(3)] == [e.id for e in events[::-1]]
+
     def test_find_divergences_empty_when_no_logprobs(self):
         """v0 normal case: no logprobs means no divergences found."""
         loom = Loom.create("The ", brief="")
@@ -366,6 +545,54 @@ class TestLoom:
         assert len(clarifications) == 1
         assert clarifications[0].action == "clarify"
 
+    def test_find_clarifications_skips_committed_events(self):
+        loom = Loom.create("The ", brief="")
+        root = loom.get_tip()
+        candidates = [
+            Node.from_candidate(root, "quick", []),
+            Node.from_candidate(root, "slow", []),
+        ]
+        event = loom.add_candidates(root.id, candidates)
+        event.resolve_clarify("Which?", ["a", "b"], "tone")
+        assert loom.find_clarifications() == [event]
+
+        # Clarification resolved by a later choice
+        loom.commit_choice(event.id, candidates[0].id, "human", "answered")
+        assert loom.find_clarifications() == []
+
+    def test_queries_after_from_dict(self):
+        loom = Loom.create("The ", brief="")
+        root = loom.get_tip()
+        c1 = Node.from_candidate(root, "quick", [], step_logprob=-3.0)
+        c2 = Node.from_candidate(root, "slow", [], step_logprob=-1.0)
+        event = loom.add_candidates(root.id, [c1, c2])
+        loom.commit_choice(event.id, c1.id, "selector_llm", "override")
+        tip = loom.get_tip()
+        pending = loom.add_candidates(tip.id, [Node.from_candidate(tip, " fox", [])])
+        pending.resolve_clarify("Which?", [], "tone")
+
+        restored = Loom.from_dict(loom.to_dict())
+
+        assert [e.id for e in restored.find_divergences(threshold=-1.0)] == [event.id]
+        assert [e.id for e in restored.find_clarifications()] == [pending.id]
+
+    def test_queries_see_events_resolved_outside_loom(self):
+        loom = Loom.create("The ", brief="")
+        root = loom.get_tip()
+        c1 = Node.from_candidate(root, "quick", [], step_logprob=-3.0)
+        c2 = Node.from_candidate(root, "slow", [], step_logprob=-1.0)
+        event = loom.add_candidates(root.id, [c1, c2])
+        event.resolve_choose(c1.id, "selector_llm", "override", nodes=loom.nodes)
+        inserted = DecisionEvent.create(root.id, [c2.id])
+        inserted.resolve_clarify("Which?", [], "tone")
+        loom.decision_events[inserted.id] = inserted
+
+        assert loom.find_divergences(threshold=-1.0) == [event]
+        assert loom.find_clarifications() == [inserted]
+
+        inserted.resolve_stop("done")
+        assert loom.find_clarifications() == []
+
     def test_to_dict_from_dict_roundtrip(self):
         loom = Loom.create("The quick", brief="Test brief", config={"k": "v"})
         root = loom.get_tip()
@@ -394,7 +621,7 @@ class TestLoom:
         for node_id, node in loom.nodes.items():
             restored_node = restored.nodes[node_id]
             assert restored_node.text == node.text
-            assert restored_node.full_text == node.full_text
+            assert restored.get_full_text(node_id) == loom.get_full_text(node_id)
             assert restored_node.parent_id == node.parent_id
             assert restored_node.was_chosen == node.was_chosen
 
@@ -404,6 +631,99 @@ class TestLoom:
             assert restored_event.action == event.action
             assert restored_event.chosen_node_id == event.chosen_node_id
 
+    def test_to_dict_shares_containers_instead_of_copying(self):
+        loom = Loom.create("The ", brief="")
+        root = loom.get_tip()
+        candidate = Node.from_candidate(root, "quick", [1])
+        candidate.scores["pull"] = 0.7
+        event = loom.add_candidates(root.id, [candidate])
+
+        data = loom.to_dict()
+
+        assert data["nodes"][candidate.id]["scores"] is candidate.scores
+        assert data["decision_events"][event.id]["candidate_node_ids"] is event.candidate_node_ids
+
+    def test_to_dict_matches_asdict(self):
+        loom = Loom.create("The ", brief="")
+        root = loom.get_tip()
+        candidates = [
+            Node.from_candidate(root, "quick", [1], token_logprobs=[-0.5], step_logprob=-0.5),
+            Node.from_candidate(root, "slow", [2]),
+        ]
+        candidates[0].scores["pull"] = 0.7
+        event = loom.add_candidates(root.id, candidates)
+        loom.commit_choice(event.id, candidates[0].id, "human", "ok")
+
+        data = loom.to_dict()
+
+        for node_id, node in loom.nodes.items():
+            expected = asdict(node)
+            expected["token_ids"] = list(node.token_ids)
+            if node.token_logprobs is not None:
+                expected["token_logprobs"] = list(node.token_logprobs)
+            assert data["nodes"][node_id] == expected
+        assert data["decision_events"][event.id] == asdict(event)
+
+    def test_add_candidates_sets_depth_from_parent(self):
+        loom = Loom.create("The ", brief="")
+        for word in ["quick ", "brown "]:
+            tip = loom.get_tip()
+            candidates = [Node.from_candidate(tip, word, [])]
+            event = loom.add_candidates(tip.id, candidates)
+            loom.commit_choice(event.id, candidates[0].id, "human", "ok")
+
+        depths = [loom.nodes[nid].depth for nid in loom.current_path]
+        assert depths == [0, 1, 2]
+
+    def test_from_dict_backfills_missing_depth(self):
+        loom = Loom.create("The ", brief="")
+        for word in ["quick ", "brown "]:
+            tip = loom.get_tip()
+            candidates = [Node.from_candidate(tip, word, [])]
+            event = loom.add_candidates(tip.id, candidates)
+            loom.commit_choice(event.id, candidates[0].id, "human", "ok")
+
+        data = loom.to_dict()
+        for record in data["nodes"].values():
+            del record["depth"]
+
+        restored = Loom.from_dict(data)
+        assert [restored.nodes[nid].depth for nid in restored.current_path] == [0, 1, 2]
+
+    def test_from_dict_interns_repeated_strings(self):
+        import json
+        import sys
+
+        loom = Loom.create("The ", brief="")
+        root = loom.get_tip()
+        candidates = [Node.from_candidate(root, w, []) for w in ("a", "b", "c")]
+        event = loom.add_candidates(root.id, candidates)
+        loom.commit_choice(event.id, candidates[0].id, "human", "ok")
+
+        restored = Loom.from_dict(json.loads(json.dumps(loom.to_dict())))
+
+        a, b, c = (restored.nodes[n.id] for n in candidates)
+        assert a.parent_id is b.parent_id is c.parent_id
+        assert a.decision_id is b.decision_id
+        restored_event = restored.decision_events[event.id]
+        assert restored_event.action is sys.intern("choose")
+        assert restored_event.chosen_by is a.chosen_by
+
+    def test_from_dict_ignores_legacy_full_text(self):
+        """Files written before full_text was dropped still load."""
+        loom = Loom.create("The ", brief="")
+        root = loom.get_tip()
+        child = Node.from_candidate(root, "end", [])
+        event = loom.add_candidates(root.id, [child])
+        loom.commit_choice(event.id, child.id, "human", "ok")
+
+        data = loom.to_dict()
+        data["nodes"][root.id]["full_text"] = "The "
+        data["nodes"][child.id]["full_text"] = "The end"
+
+        restored = Loom.from_dict(data)
+        assert restored.get_current_text() == "The end"
+
     def test_to_dict_from_dict_preserves_none_logprobs(self):
         """v0: None logprobs must serialize/deserialize correctly."""
         loom = Loom.create("seed", brief="")
@@ -0,0 +1,208 @@
+"""Tests for ClaudeBatchGenerator (mocked Anthropic batches client)."""
+
+import types
+
+import pytest
+
+from loom.generators.claude_batch import BatchError, ClaudeBatchGenerator
+
+
+def _entry(custom_id: str, result_type: str = "succeeded", text: str = ""):
+    message = types.SimpleNamespace(content=[types.SimpleNamespace(text=text)])
+    result = types.SimpleNamespace(type=result_type, message=message)
+    return types.SimpleNamespace(custom_id=custom_id, result=result)
+
+
+class _StubBatches:
+    def __init__(self, polls_until_ended: int = 1, failed: tuple = ()):
+        self.created = []
+        self.retrieved = 0
+        self.cancelled = []
+        self.polls_until_ended = polls_until_ended
+        self.failed = failed
+
+    def create(self, *, requests):
+        self.created.append(requests)
+        return types.SimpleNamespace(id="batch_1", processing_status="in_progress")
+
+    def retrieve(self, batch_id):
+        assert batch_id == "batch_1"
+        self.retrieved += 1
+        status = "ended" if self.retrieved >= self.polls_until_ended else "in_progress"
+        return types.SimpleNamespace(id=batch_id, processing_status=status)
+
+    def cancel(self, batch_id):
+        self.cancelled.append(batch_id)
+
+    def results(self, batch_id):
+        requests = self.created[-1]
+        # Results may arrive in any order; return them reversed.
+        for req in reversed(requests):
+            cid = req["custom_id"]
+            if cid in self.failed:
+                yield _entry(cid, result_type="errored")
+            else:
+                yield _entry(cid, text=f"text for {cid}")
+
+
+def _make_client(batches: _StubBatches):
+    return types.SimpleNamespace(messages=types.SimpleNamespace(batches=batches))
+
+
+def test_batch_generator_submits_one_batch_and_polls():
+    batches = _StubBatches(polls_until_ended=2)
+    sleeps = []
+    gen = ClaudeBatchGenerator(
+        client=_make_client(batches),
+        model="model-x",
+        temperature=0.9,
+        top_p=0.8,
+        poll_interval=0.5,
+        sleep=sleeps.append,
+    )
+
+    candidates = gen.generate_candidates(
+        full_text="Existing text.",
+        fewshot_examples="",
+        section_intent="Explain",
+        rough_draft=None,
+        n=3,
+        max_tokens=6,
+    )
+
+    assert len(batches.created) == 1
+    requests = batches.created[0]
+    assert [r["custom_id"] for r in requests] == ["cand-0", "cand-1", "cand-2"]
+    for req in requests:
+        params = req["params"]
+        assert params["model"] == "model-x"
+        assert params["max_tokens"] == 6
+        assert params["temperature"] == 0.9
+        assert params["top_p"] == 0.8
+        assert "[SECTION INTENT]" in params["messages"][0]["content"][0]["text"]
+
+    assert sleeps == [0.5, 0.5]
+    # Candidates come back in submission order regardless of result order
+    assert [c.text for c in candidates] == [
+        "text for cand-0",
+        "text for cand-1",
+        "text for cand-2",
+    ]
+    assert all(c.token_logprobs is None for c in candidates)
+    assert all(c.step_logprob is None for c in candidates)
+
+
+def test_batch_generator_raises_on_partial_failure():
+    batches = _StubBatches(failed=("cand-1",))
+    gen = ClaudeBatchGenerator(client=_make_client(batches), sleep=lambda _: None)
+
+    with pytest.raises(BatchError) as info:
+        gen.generate_candidates(
+            full_text="x",
+            fewshot_examples="",
+            section_intent="",
+            rough_draft=None,
+            n=3,
+            max_tokens=6,
+        )
+
+    assert info.value.batch_id == "batch_1"
+    assert info.value.failures == {"cand-1": "errored"}
+    assert info.value.texts == {"cand-0": "text for cand-0", "cand-2": "text for cand-2"}
+    assert "1 of 3 requests" in str(info.value)
+
+
+def test_batch_generator_counts_requests_without_results():
+    class _ShortBatches(_StubBatches):
+        def results(self, batch_id):
+            yield from list(super().results(batch_id))[1:]  # drop the last request
+
+    gen = ClaudeBatchGenerator(client=_make_client(_ShortBatches()), sleep=lambda _: None)
+
+    with pytest.raises(BatchError) as info:
+        gen.generate_candidates(
+            full_text="x",
+            fewshot_examples="",
+            section_intent="",
+            rough_draft=None,
+            n=2,
+            max_tokens=6,
+        )
+
+    assert info.value.failures == {"cand-1": "missing"}
+
+
+def test_batch_generator_cancels_batch_after_timeout():
+    batches = _StubBatches(polls_until_ended=100)
+    now = [0.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    gen = ClaudeBatchGenerator(
+        client=_make_client(batches),
+        poll_interval=5.0,
+        timeout=12.0,
+        sleep=sleep,
+        clock=lambda: now[0],
+    )
+
+    with pytest.raises(TimeoutError):
+        gen.generate_candidates(
+            full_text="x",
+            fewshot_examples="",
+            section_intent="",
+            rough_draft=None,
+            n=2,
+            max_tokens=6,
+        )
+
+    assert batches.cancelled == ["batch_1"]
+    assert batches.retrieved == 3  # polled at t=5, 10, 15; gave up at 15 >= 12
+
+
+def test_batch_generator_iter_candidates_uses_the_batch():
+    batches = _StubBatches()
+    client = _make_client(batches)  # no messages.create: a sync call would fail
+    gen = ClaudeBatchGenerator(client=client, sleep=lambda _: None)
+
+    candidates = list(
+        gen.iter_candidates(
+            full_text="x",
+            fewshot_examples="",
+            section_intent="",
+            rough_draft=None,
+            n=2,
+            max_tokens=6,
+        )
+    )
+
+    assert len(batches.created) == 1
+    assert [c.text for c in candidates] == ["text for cand-0", "text for cand-1"]
+
+
+def test_batch_generator_multi_uses_one_batch_for_all_paths():
+    from loom.generators.base import PromptContext
+
+    batches = _StubBatches()
+    gen = ClaudeBatchGenerator(client=_make_client(batches), sleep=lambda _: None)
+    contexts = [
+        PromptContext(full_text=f"path {j}", fewshot_examples="", section_intent="", rough_draft=None)
+        for j in range(2)
+    ]
+
+    results = gen.generate_candidates_multi(contexts=contexts, n=2, max_tokens=6)
+
+    assert len(batches.created) == 1
+    requests = batches.created[0]
+    assert [r["custom_id"] for r in requests] == [
+        "path-0-cand-0",
+        "path-0-cand-1",
+        "path-1-cand-0",
+        "path-1-cand-1",
+    ]
+    assert "path 1" in requests[2]["params"]["messages"][0]["content"][0]["text"]
+    assert [[c.text for c in cands] for cands in results] == [
+        ["text for path-0-cand-0", "text for path-0-cand-1"],
+        ["text for path-1-cand-0", "text for path-1-cand-1"],
+    ]
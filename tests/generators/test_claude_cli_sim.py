@@ -1,5 +1,9 @@
 """Tests for ClaudeCLISimGenerator (mocked Anthropic client)."""
 
+import threading
+import time
+
+from loom.generators.base import PromptContext
 from loom.generators.claude_cli_sim import ClaudeCLISimGenerator
 
 
@@ -28,6 +32,10 @@ class _StubClient:
         self.messages = _StubMessages(self.calls)
 
 
+def _content_text(call: dict) -> str:
+    return "".join(block["text"] for block in call["messages"][0]["content"])
+
+
 def test_claude_cli_sim_calls_anthropic_and_returns_candidates():
     client = _StubClient()
     gen = ClaudeCLISimGenerator(client=client, model="model-x", temperature=0.9, top_p=0.8)
@@ -49,7 +57,7 @@ def test_claude_cli_sim_calls_anthropic_and_returns_candidates():
         assert call["temperature"] == 0.9
         assert call["top_p"] == 0.8
         # Prompt should include CONTINUE and SECTION INTENT
-        prompt = call["messages"][0]["content"]
+        prompt = _content_text(call)
         assert "[SECTION INTENT]" in prompt
         assert "[CONTINUE]" in prompt
 
@@ -60,3 +68,352 @@ def test_claude_cli_sim_calls_anthropic_and_returns_candidates():
     assert all(c.token_logprobs is None for c in candidates)
     assert all(c.step_logprob is None for c in candidates)
 
+
+class _BarrierMessages:
+    """Stub whose create() blocks until `parties` calls are in flight."""
+
+    def __init__(self, parties: int):
+        self.barrier = threading.Barrier(parties, timeout=5)
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def create(self, **kwargs):
+        with self.lock:
+            idx = self.count
+            self.count += 1
+        self.barrier.wait()  # raises BrokenBarrierError if calls are serialized
+        return _StubResponse(text=f"out_{idx}")
+
+
+def test_claude_cli_sim_issues_requests_concurrently():
+    client = _StubClient()
+    client.messages = _BarrierMessages(parties=3)
+    gen = ClaudeCLISimGenerator(client=client)
+
+    candidates = gen.generate_candidates(
+        full_text="Existing text.",
+        fewshot_examples="",
+        section_intent="Explain",
+        rough_draft=None,
+        n=3,
+        max_tokens=6,
+    )
+
+    assert client.messages.count == 3
+    assert sorted(c.text for c in candidates) == ["out_0", "out_1", "out_2"]
+
+
+def test_claude_cli_sim_marks_brief_prefix_for_prompt_caching():
+    client = _StubClient()
+    gen = ClaudeCLISimGenerator(client=client)
+
+    gen.generate_candidates(
+        full_text="Existing text.",
+        fewshot_examples="ex1",
+        section_intent="Explain",
+        rough_draft=None,
+        n=1,
+        max_tokens=6,
+    )
+
+    prefix_block, text_block, tail_block = client.calls[0]["messages"][0]["content"]
+    assert prefix_block["cache_control"] == {"type": "ephemeral"}
+    assert prefix_block["text"].startswith("<cmd>cat draft.txt</cmd>")
+    assert "[FEW-SHOT TEXTURE EXAMPLES]" in prefix_block["text"]
+    assert "[SECTION INTENT]" in prefix_block["text"]
+    assert text_block["cache_control"] == {"type": "ephemeral"}
+    assert text_block["text"] == "\n\n[CRAFTED TEXT SO FAR]\nExisting text."
+    assert "cache_control" not in tail_block
+    assert tail_block["text"] == "\n\n[CONTINUE]"
+
+
+def test_claude_cli_sim_without_brief_sections_caches_crafted_text():
+    client = _StubClient()
+    gen = ClaudeCLISimGenerator(client=client)
+
+    gen.generate_candidates(
+        full_text="Existing text.",
+        fewshot_examples="",
+        section_intent="",
+        rough_draft=None,
+        n=1,
+        max_tokens=6,
+    )
+
+    text_block, tail_block = client.calls[0]["messages"][0]["content"]
+    assert text_block["cache_control"] == {"type": "ephemeral"}
+    assert text_block["text"] == "<cmd>cat draft.txt</cmd>\n\n[CRAFTED TEXT SO FAR]\nExisting text."
+    assert "cache_control" not in tail_block
+
+
+def test_claude_cli_sim_empty_text_sends_single_uncached_block():
+    client = _StubClient()
+    gen = ClaudeCLISimGenerator(client=client)
+
+    gen.generate_candidates(
+        full_text="",
+        fewshot_examples="",
+        section_intent="",
+        rough_draft=None,
+        n=1,
+        max_tokens=6,
+    )
+
+    (block,) = client.calls[0]["messages"][0]["content"]
+    assert "cache_control" not in block
+    assert block["text"] == "<cmd>cat draft.txt</cmd>\n\n[CRAFTED TEXT SO FAR]\n\n\n[CONTINUE]"
+
+
+def test_claude_cli_sim_keeps_previous_text_as_block_boundary():
+    client = _StubClient()
+    gen = ClaudeCLISimGenerator(client=client)
+    kwargs = dict(fewshot_examples="ex1", section_intent="", rough_draft=None, n=2, max_tokens=6)
+
+    gen.generate_candidates(full_text="The quick", **kwargs)
+    gen.generate_candidates(full_text="The quick brown", **kwargs)
+
+    first, second = client.calls[0], client.calls[2]
+    assert client.calls[1] == first  # all samples of a step share params
+    assert _content_text(first).replace("The quick", "The quick brown") == _content_text(second)
+
+    blocks = second["messages"][0]["content"]
+    assert [b["text"] for b in blocks[1:]] == [
+        "\n\n[CRAFTED TEXT SO FAR]\nThe quick",
+        " brown",
+        "\n\n[CONTINUE]",
+    ]
+    assert ["cache_control" in b for b in blocks] == [True, False, True, False]
+    # The boundary matches where the first request's cached text block ended
+    assert _content_text(first).startswith("".join(b["text"] for b in blocks[:2]))
+
+
+def test_claude_cli_sim_keeps_block_boundaries_stable_across_steps():
+    client = _StubClient()
+    gen = ClaudeCLISimGenerator(client=client)
+    kwargs = dict(fewshot_examples="ex1", section_intent="", rough_draft=None, n=1, max_tokens=6)
+    steps = ["The quick", "The quick brown", "The quick brown fox", "The quick brown fox jumps"]
+
+    for text in steps:
+        gen.generate_candidates(full_text=text, **kwargs)
+
+    def texts(call):
+        return [b["text"] for b in call["messages"][0]["content"]]
+
+    for previous, current in zip(client.calls, client.calls[1:]):
+        # Everything up to the previous step's cached text block is repeated
+        # block for block; only the new segment and CONTINUE follow it.
+        cached = texts(previous)[:-1]
+        assert texts(current)[: len(cached)] == cached
+        assert len(texts(current)) == len(cached) + 2
+
+    blocks = client.calls[-1]["messages"][0]["content"]
+    assert [b["text"] for b in blocks[1:]] == [
+        "\n\n[CRAFTED TEXT SO FAR]\nThe quick",
+        " brown",
+        " fox",
+        " jumps",
+        "\n\n[CONTINUE]",
+    ]
+    assert ["cache_control" in b for b in blocks] == [True, False, False, False, True, False]
+
+
+def test_claude_cli_sim_splits_each_path_at_its_own_previous_text():
+    client = _StubClient()
+    gen = ClaudeCLISimGenerator(client=client)
+
+    def ctx(text):
+        return PromptContext(full_text=text, fewshot_examples="", section_intent="", rough_draft=None)
+
+    gen.generate_candidates_multi(contexts=[ctx("A one"), ctx("B one")], n=1, max_tokens=6)
+    gen.generate_candidates_multi(contexts=[ctx("A one two"), ctx("B one three")], n=1, max_tokens=6)
+
+    a_blocks, b_blocks = (call["messages"][0]["content"] for call in client.calls[2:])
+    assert [b["text"] for b in a_blocks[:2]] == [
+        "<cmd>cat draft.txt</cmd>\n\n[CRAFTED TEXT SO FAR]\nA one",
+        " two",
+    ]
+    assert [b["text"] for b in b_blocks[:2]] == [
+        "<cmd>cat draft.txt</cmd>\n\n[CRAFTED TEXT SO FAR]\nB one",
+        " three",
+    ]
+
+
+def test_claude_cli_sim_never_sends_whitespace_only_blocks():
+    client = _StubClient()
+    gen = ClaudeCLISimGenerator(client=client)
+    kwargs = dict(fewshot_examples="", section_intent="", rough_draft=None, n=1, max_tokens=6)
+
+    gen.generate_candidates(full_text="The quick", **kwargs)
+    gen.generate_candidates(full_text="The quick \n ", **kwargs)
+
+    blocks = client.calls[1]["messages"][0]["content"]
+    assert all(block["text"].strip() for block in blocks)
+    assert _content_text(client.calls[1]).endswith("The quick \n \n\n[CONTINUE]")
+
+
+class _EchoMessages:
+    """Stub that answers with the prompt text, so results can be traced to their path."""
+
+    def __init__(self):
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return _StubResponse(text=_content_text(kwargs))
+
+
+def test_claude_cli_sim_multi_groups_candidates_by_context():
+    client = _StubClient()
+    client.messages = _EchoMessages()
+    gen = ClaudeCLISimGenerator(client=client)
+    contexts = [
+        PromptContext(full_text=f"path {j}.", fewshot_examples="", section_intent="", rough_draft=None)
+        for j in range(3)
+    ]
+
+    results = gen.generate_candidates_multi(contexts=contexts, n=2, max_tokens=6)
+
+    assert len(client.messages.calls) == 6
+    assert [len(cands) for cands in results] == [2, 2, 2]
+    for j, cands in enumerate(results):
+        assert all(f"path {j}." in c.text for c in cands)
+
+
+class _CountingMessages:
+    """Stub that tracks the peak number of concurrent create() calls."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+
+    def create(self, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.01)
+        with self.lock:
+            self.in_flight -= 1
+        return _StubResponse(text="out")
+
+
+def test_claude_cli_sim_caps_in_flight_requests():
+    client = _StubClient()
+    client.messages = _CountingMessages()
+    gen = ClaudeCLISimGenerator(client=client, max_concurrency=2)
+
+    candidates = gen.generate_candidates(
+        full_text="x",
+        fewshot_examples="",
+        section_intent="",
+        rough_draft=None,
+        n=6,
+        max_tokens=6,
+    )
+
+    assert len(candidates) == 6
+    assert client.messages.peak <= 2
+
+
+def test_claude_cli_sim_single_call_splits_delimited_response():
+    client = _StubClient()
+
+    def create(**kwargs):
+        client.calls.append(kwargs)
+        return _StubResponse(text=" one\n###CAND###\n two\n###CAND###\n three\n###CAND###\n four")
+
+    client.messages.create = create
+    gen = ClaudeCLISimGenerator(client=client, single_call=True)
+
+    candidates = gen.generate_candidates(
+        full_text="Existing text.",
+        fewshot_examples="",
+        section_intent="Explain",
+        rough_draft=None,
+        n=3,
+        max_tokens=6,
+    )
+
+    assert len(client.calls) == 1
+    assert client.calls[0]["max_tokens"] == 18
+    prompt = _content_text(client.calls[0])
+    assert "produce 3 independent continuations" in prompt
+    assert '"###CAND###"' in prompt
+    assert [c.text for c in candidates] == [" one", " two", " three"]
+
+
+def test_claude_cli_sim_iter_candidates_yields_in_completion_order():
+    release_first = threading.Event()
+
+    class _OrderedMessages:
+        def __init__(self):
+            self.count = 0
+            self.lock = threading.Lock()
+
+        def create(self, **kwargs):
+            with self.lock:
+                idx = self.count
+                self.count += 1
+            if idx == 0:
+                # The first request finishes last.
+                assert release_first.wait(timeout=5)
+            return _StubResponse(text=f"out_{idx}")
+
+    client = _StubClient()
+    client.messages = _OrderedMessages()
+    gen = ClaudeCLISimGenerator(client=client)
+
+    texts = []
+    for cand in gen.iter_candidates(
+        full_text="x",
+        fewshot_examples="",
+        section_intent="",
+        rough_draft=None,
+        n=3,
+        max_tokens=6,
+    ):
+        texts.append(cand.text)
+        if len(texts) == 2:
+            release_first.set()
+
+    assert sorted(texts[:2]) == ["out_1", "out_2"]
+    assert texts[2] == "out_0"
+
+
+def test_claude_cli_sim_iter_candidates_close_does_not_wait_for_requests():
+    release = threading.Event()
+
+    class _SlowMessages:
+        def __init__(self):
+            self.count = 0
+            self.lock = threading.Lock()
+
+        def create(self, **kwargs):
+            with self.lock:
+                idx = self.count
+                self.count += 1
+            if idx > 0:
+                release.wait(timeout=5)
+            return _StubResponse(text=f"out_{idx}")
+
+    client = _StubClient()
+    client.messages = _SlowMessages()
+    gen = ClaudeCLISimGenerator(client=client, max_concurrency=2)
+
+    it = gen.iter_candidates(
+        full_text="x",
+        fewshot_examples="",
+        section_intent="",
+        rough_draft=None,
+        n=4,
+        max_tokens=6,
+    )
+    assert next(it).text == "out_0"
+    start = time.monotonic()
+    it.close()
+    elapsed = time.monotonic() - start
+    release.set()
+    time.sleep(0.1)
+
+    assert elapsed < 1.0
+    assert client.messages.count < 4  # the request still queued was cancelled
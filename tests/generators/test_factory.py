@@ -5,6 +5,7 @@ import types
 import pytest
 
 from loom.generators import make_generator
+from loom.generators.claude_batch import ClaudeBatchGenerator
 from loom.generators.claude_cli_sim import ClaudeCLISimGenerator
 
 
@@ -14,6 +15,9 @@ class _StubCfg:
         self.model_name = "model-x"
         self.temperature = 0.9
         self.top_p = 0.8
+        self.max_concurrency = 3
+        self.single_call = True
+        self.batch_timeout = 60.0
 
 
 def test_make_generator_returns_claude_cli_sim():
@@ -25,6 +29,19 @@ def test_make_generator_returns_claude_cli_sim():
     assert gen.model == "model-x"
     assert gen.temperature == 0.9
     assert gen.top_p == 0.8
+    assert gen.max_concurrency == 3
+    assert gen.single_call is True
+
+
+def test_make_generator_returns_claude_batch():
+    cfg = _StubCfg(engine_type="claude_batch")
+
+    gen = make_generator(cfg, types.SimpleNamespace())
+    assert isinstance(gen, ClaudeBatchGenerator)
+    assert gen.model == "model-x"
+    assert gen.temperature == 0.9
+    assert gen.top_p == 0.8
+    assert gen.timeout == 60.0
 
 
 def test_make_generator_unknown_engine_type():
@@ -32,3 +49,24 @@ def test_make_generator_unknown_engine_type():
     with pytest.raises(ValueError):
         make_generator(cfg, types.SimpleNamespace())
 
+
+def test_make_client_keeps_pooled_connections_alive_between_steps(monkeypatch):
+    import anthropic
+
+    from loom.core.config import BaseEngineConfig
+    from loom.generators import make_client
+
+    seen = {}
+    real_http_client = anthropic.DefaultHttpxClient
+
+    def recording_http_client(*, limits):
+        seen["limits"] = limits
+        return real_http_client(limits=limits)
+
+    monkeypatch.setattr(anthropic, "DefaultHttpxClient", recording_http_client)
+
+    client = make_client(BaseEngineConfig(max_concurrency=500), api_key="test-key")
+
+    assert isinstance(client, anthropic.Anthropic)
+    assert seen["limits"].keepalive_expiry == 120.0
+    assert seen["limits"].max_keepalive_connections >= 500
@@ -21,3 +21,28 @@ def test_fake_generator_returns_deterministic_candidates():
     assert all(c.token_logprobs is None for c in candidates)
     assert all(c.step_logprob == -1.0 for c in candidates)
 
+
+def test_fake_generator_iter_candidates_uses_protocol_default():
+    gen = FakeGenerator(prefix="opt_")
+
+    candidates = gen.iter_candidates(
+        full_text="text",
+        fewshot_examples="",
+        section_intent="",
+        rough_draft=None,
+        n=2,
+        max_tokens=5,
+    )
+
+    assert [c.text for c in candidates] == ["opt_0", "opt_1"]
+
+
+def test_fake_generator_reuses_texts_across_calls():
+    gen = FakeGenerator(prefix="opt_")
+    kwargs = dict(full_text="", fewshot_examples="", section_intent="", rough_draft=None, max_tokens=5)
+
+    small = gen.generate_candidates(n=2, **kwargs)
+    large = gen.generate_candidates(n=4, **kwargs)
+
+    assert [c.text for c in large] == ["opt_0", "opt_1", "opt_2", "opt_3"]
+    assert small[1].text is large[1].text
@@ -0,0 +1,59 @@
+"""Tests for DaemonThreadPoolExecutor."""
+
+import threading
+
+import pytest
+
+from loom.generators.pool import DaemonThreadPoolExecutor
+
+
+def test_daemon_pool_runs_tasks_on_daemon_threads():
+    with DaemonThreadPoolExecutor(max_workers=2) as pool:
+        future = pool.submit(lambda x: (x, threading.current_thread().daemon), 1)
+        failing = pool.submit(lambda: 1 / 0)
+
+    assert future.result(timeout=5) == (1, True)
+    with pytest.raises(ZeroDivisionError):
+        failing.result(timeout=5)
+
+
+def test_daemon_pool_bounds_concurrency_and_keeps_map_order():
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def work(i):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        threading.Event().wait(0.02)
+        with lock:
+            running[0] -= 1
+        return i
+
+    with DaemonThreadPoolExecutor(max_workers=2) as pool:
+        assert list(pool.map(work, range(6))) == list(range(6))
+    assert peak[0] <= 2
+
+
+def test_daemon_pool_shutdown_cancels_waiting_tasks_without_waiting():
+    started = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        started.set()
+        return release.wait(5)
+
+    pool = DaemonThreadPoolExecutor(max_workers=1)
+    running = pool.submit(hold)
+    assert started.wait(5)
+    waiting = pool.submit(lambda: "never")
+
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    assert waiting.cancelled()
+    assert not running.done()
+    release.set()
+    assert running.result(timeout=5) is True
+    with pytest.raises(RuntimeError):
+        pool.submit(lambda: None)
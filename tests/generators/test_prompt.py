@@ -1,7 +1,7 @@
 """Tests for prompt builder."""
 
 from loom.brief import Brief
-from loom.generators.prompt import build_base_prompt
+from loom.generators.prompt import build_base_prompt, build_base_prompt_parts, split_candidates
 
 
 def test_build_base_prompt_with_all_sections():
@@ -42,3 +42,46 @@ def test_build_base_prompt_no_intent():
     prompt = build_base_prompt(brief, "Some text")
     assert "[SECTION INTENT]" not in prompt
     assert "[CRAFTED TEXT SO FAR]" in prompt
+
+
+def test_build_base_prompt_parts_split_brief_from_text():
+    brief = Brief(fewshot_examples="ex1", section_intent="Intent")
+    prefix, tail = build_base_prompt_parts(brief, "Text so far")
+
+    assert "[FEW-SHOT TEXTURE EXAMPLES]" in prefix
+    assert "[SECTION INTENT]" in prefix
+    assert "Text so far" not in prefix
+    assert tail == "[CRAFTED TEXT SO FAR]\nText so far\n\n[CONTINUE]"
+    assert build_base_prompt(brief, "Text so far") == f"{prefix}\n\n{tail}"
+
+
+def test_build_base_prompt_parts_empty_prefix():
+    prefix, tail = build_base_prompt_parts(Brief(), "Text")
+    assert prefix == ""
+    assert build_base_prompt(Brief(), "Text") == tail
+
+
+def test_prompt_parts_request_delimited_continuations():
+    brief = Brief(section_intent="Intent")
+    _, tail = build_base_prompt_parts(brief, "Text", n_continuations=4)
+    assert tail.endswith('[CONTINUE — produce 4 independent continuations separated by the line "###CAND###"]')
+
+
+def test_split_candidates_drops_delimiters_and_empty_chunks():
+    text = "###CAND###\n a\n###CAND###  \n b\n\n###CAND###\n"
+    assert split_candidates(text, 5) == [" a", " b\n"]
+    assert split_candidates(text, 1) == [" a"]
+
+
+def test_prompt_prefix_rendered_once_per_brief():
+    from loom.generators.prompt import _render_prefix
+
+    brief = Brief(fewshot_examples="ex " * 1000, section_intent="Intent")
+    first, _ = build_base_prompt_parts(brief, "a")
+    second, _ = build_base_prompt_parts(brief, "a b")
+    assert first is second
+    assert _render_prefix.cache_info().hits >= 1
+
+    brief.section_intent = "Changed"
+    changed, _ = build_base_prompt_parts(brief, "a b")
+    assert "[SECTION INTENT]\nChanged" in changed
@@ -0,0 +1,94 @@
+"""Tests for loom.io.journal: JournalWriter, replay_journal."""
+
+import pytest
+
+from loom.core.models import Loom, Node
+from loom.io.journal import JournalWriter, replay_journal
+from loom.io.manifest import read_manifest
+
+
+def _step(loom: Loom, texts, journal: JournalWriter):
+    tip = loom.get_tip()
+    nodes = [
+        Node.from_candidate(tip, text, [i], token_logprobs=[-1.0 - i])
+        for i, text in enumerate(texts)
+    ]
+    event = loom.add_candidates(tip.id, nodes)
+    journal.record_add(event, nodes)
+    return event, nodes
+
+
+class TestJournalWriter:
+    """Tests for JournalWriter."""
+
+    def test_appends_one_record_per_change(self, tmp_path):
+        path = tmp_path / "journal.ndjson"
+        loom = Loom.create("The ", brief="brief")
+
+        with JournalWriter(path) as journal:
+            journal.snapshot(loom)
+            event, nodes = _step(loom, ["quick ", "slow "], journal)
+            loom.commit_choice(event.id, nodes[0].id, "human", "ok")
+            journal.record_choice(loom.decision_events[event.id], nodes[0])
+
+        records = read_manifest(path)
+        assert [r["op"] for r in records] == ["snapshot", "add", "choose"]
+        assert [n["id"] for n in records[1]["nodes"]] == [n.id for n in nodes]
+        assert records[2]["event"]["chosen_node_id"] == nodes[0].id
+
+    def test_writes_are_flushed_per_record(self, tmp_path):
+        path = tmp_path / "journal.ndjson"
+        loom = Loom.create("The ", brief="")
+        journal = JournalWriter(path)
+        journal.snapshot(loom)
+
+        assert len(read_manifest(path)) == 1
+        journal.close()
+        journal.close()
+
+
+class TestReplayJournal:
+    """Tests for replay_journal."""
+
+    def test_replay_matches_to_dict(self, tmp_path):
+        path = tmp_path / "journal.ndjson"
+        loom = Loom.create("The ", brief="brief")
+
+        with JournalWriter(path) as journal:
+            journal.snapshot(loom)
+            event, nodes = _step(loom, ["quick ", "slow "], journal)
+            loom.commit_choice(event.id, nodes[1].id, "human", "ok")
+            journal.record_choice(loom.decision_events[event.id], nodes[1])
+            event, _ = _step(loom, ["fox", "dog"], journal)
+            loom.commit_stop(event.id, "done")
+            journal.record_stop(loom.decision_events[event.id])
+
+        restored = replay_journal(path)
+
+        assert restored.to_dict() == loom.to_dict()
+        assert restored.get_current_text() == "The slow "
+        restored_ids = [e.id for e in restored.find_divergences(threshold=0.0)]
+        assert restored_ids == [e.id for e in loom.find_divergences(threshold=0.0)]
+
+    def test_replay_starts_from_latest_snapshot(self, tmp_path):
+        path = tmp_path / "journal.ndjson"
+        loom = Loom.create("The ", brief="")
+
+        with JournalWriter(path) as journal:
+            journal.snapshot(loom)
+            event, nodes = _step(loom, ["a", "b"], journal)
+            loom.commit_choice(event.id, nodes[0].id, "human", "ok")
+            journal.record_choice(loom.decision_events[event.id], nodes[0])
+            journal.snapshot(loom)
+            _step(loom, ["c"], journal)
+
+        assert replay_journal(path).to_dict() == loom.to_dict()
+
+    def test_replay_requires_snapshot(self, tmp_path):
+        path = tmp_path / "journal.ndjson"
+        loom = Loom.create("The ", brief="")
+        with JournalWriter(path) as journal:
+            _step(loom, ["a"], journal)
+
+        with pytest.raises(ValueError):
+            replay_journal(path)
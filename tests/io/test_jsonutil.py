@@ -0,0 +1,60 @@
+"""Tests for loom.io.jsonutil with and without orjson."""
+
+import json
+
+import pytest
+
+from loom.io import jsonutil
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(jsonutil, "orjson", None)
+    return request.param
+
+
+def test_dumps_returns_compact_utf8_bytes(backend):
+    out = jsonutil.dumps({"a": None, "b": [1, 2.5], "c": "é"})
+    assert isinstance(out, bytes)
+    assert out == '{"a":null,"b":[1,2.5],"c":"é"}'.encode("utf-8")
+
+
+def test_loads_accepts_bytes_and_str(backend):
+    record = {"gap": None, "ids": ["x", "y"], "t": 1.25}
+    encoded = jsonutil.dumps(record)
+    assert jsonutil.loads(encoded) == record
+    assert jsonutil.loads(encoded.decode("utf-8")) == record
+
+
+def test_output_readable_by_stdlib(backend):
+    record = {"session_id": "s", "timestamp": 1792049994.9280553}
+    assert json.loads(jsonutil.dumps(record)) == record
+
+
+def test_loads_accepts_memoryview(backend):
+    record = {"text": "naïve", "ids": [1, 2]}
+    assert jsonutil.loads(memoryview(jsonutil.dumps(record))) == record
+
+
+def test_non_str_keys_and_non_finite_floats_match_across_backends(monkeypatch):
+    pytest.importorskip("orjson")
+    record = {
+        "config": {1: "one", 2.5: "x", None: "n"},
+        "lps": [-1.5, float("nan"), float("-inf")],
+        "meta": {"gap": float("inf")},
+    }
+    fast = jsonutil.dumps(record)
+    monkeypatch.setattr(jsonutil, "orjson", None)
+    slow = jsonutil.dumps(record)
+
+    assert fast == slow
+    expected = {
+        "config": {"1": "one", "2.5": "x", "null": "n"},
+        "lps": [-1.5, None, None],
+        "meta": {"gap": None},
+    }
+    assert json.loads(fast) == expected
+    assert jsonutil.loads(slow) == expected
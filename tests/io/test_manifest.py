@@ -1,11 +1,20 @@
-"""Tests for loom.io.manifest: append_decision_manifest, read_manifest."""
+"""Tests for loom.io.manifest: append_decision_manifest, read_manifest, iter_manifest."""
 
 import json
+import os
+import stat
 import pytest
 from pathlib import Path
 
 from loom.core.models import Loom, Node, DecisionEvent
-from loom.io.manifest import append_decision_manifest, read_manifest
+from loom.io.manifest import (
+    ManifestWriter,
+    append_decision_manifest,
+    append_decision_manifest_batch,
+    compress_manifest,
+    iter_manifest,
+    read_manifest,
+)
 
 
 class TestAppendDecisionManifest:
@@ -117,6 +126,104 @@ class TestAppendDecisionManifest:
         assert "timestamp" in record
         assert isinstance(record["timestamp"], float)
 
+    def test_interleaves_with_open_writer(self, tmp_path):
+        path = tmp_path / "manifest.ndjson"
+
+        with ManifestWriter(path) as writer:
+            writer.append(DecisionEvent.create("parent_0", ["a"]), session_id="sess")
+            append_decision_manifest(path, DecisionEvent.create("parent_1", ["b"]), "sess")
+            writer.append(DecisionEvent.create("parent_2", ["c"]), session_id="sess")
+
+        records = read_manifest(path)
+        assert [r["parent_node_id"] for r in records] == ["parent_0", "parent_1", "parent_2"]
+
+    def test_new_file_mode_follows_umask(self, tmp_path):
+        event = DecisionEvent.create("parent", ["a"])
+        event.resolve_choose("a", "human", "ok")
+        path = tmp_path / "manifest.ndjson"
+        old_umask = os.umask(0o002)
+        try:
+            append_decision_manifest(path, event, session_id="sess")
+        finally:
+            os.umask(old_umask)
+
+        assert stat.S_IMODE(path.stat().st_mode) == 0o664
+
+
+class TestManifestWriter:
+    """Tests for the session-scoped ManifestWriter."""
+
+    def test_appends_lines_through_one_handle(self, tmp_path):
+        path = tmp_path / "nested" / "manifest.ndjson"
+
+        with ManifestWriter(path) as writer:
+            for i in range(3):
+                event = DecisionEvent.create(f"parent_{i}", [f"node_{i}"])
+                event.resolve_choose(f"node_{i}", "human", f"reason_{i}")
+                writer.append(event, session_id="sess")
+
+        records = read_manifest(path)
+        assert [r["parent_node_id"] for r in records] == ["parent_0", "parent_1", "parent_2"]
+        assert all(r["session_id"] == "sess" for r in records)
+
+    def test_flush_every_buffers_until_threshold(self, tmp_path):
+        path = tmp_path / "manifest.ndjson"
+        writer = ManifestWriter(path, flush_every=2)
+        event = DecisionEvent.create("parent", ["a"])
+        event.resolve_choose("a", "human", "ok")
+
+        writer.append(event, session_id="sess")
+        assert path.read_bytes() == b""  # still buffered
+
+        writer.append(event, session_id="sess")
+        assert len(read_manifest(path)) == 2
+
+        writer.append(event, session_id="sess")
+        writer.close()
+        writer.close()  # idempotent
+        assert len(read_manifest(path)) == 3
+
+    def test_fsyncs_once_on_close(self, tmp_path, monkeypatch):
+        synced = []
+        monkeypatch.setattr("loom.io.ndjson.os.fsync", synced.append)
+        event = DecisionEvent.create("parent", ["a"])
+
+        with ManifestWriter(tmp_path / "manifest.ndjson") as writer:
+            for _ in range(3):
+                writer.append(event, session_id="sess")
+            assert synced == []
+
+        assert len(synced) == 1
+
+    def test_no_file_created_without_appends(self, tmp_path):
+        path = tmp_path / "manifest.ndjson"
+
+        with ManifestWriter(path):
+            pass
+
+        assert not path.exists()
+
+
+class TestAppendDecisionManifestBatch:
+    """Tests for append_decision_manifest_batch."""
+
+    def test_appends_all_events_in_order(self, tmp_path):
+        path = tmp_path / "manifest.ndjson"
+        append_decision_manifest(path, DecisionEvent.create("parent_0", ["a"]), "sess")
+
+        events = [DecisionEvent.create(f"parent_{i}", [f"n{i}"]) for i in range(1, 4)]
+        append_decision_manifest_batch(path, events, session_id="sess")
+
+        records = read_manifest(path)
+        assert [r["parent_node_id"] for r in records] == [f"parent_{i}" for i in range(4)]
+
+    def test_empty_batch_creates_parent_dirs(self, tmp_path):
+        path = tmp_path / "nested" / "manifest.ndjson"
+
+        append_decision_manifest_batch(path, [], session_id="sess")
+
+        assert read_manifest(path) == []
+
 
 class TestReadManifest:
     """Tests for read_manifest."""
@@ -164,6 +271,81 @@ class TestReadManifest:
 
         assert len(records) == 3
 
+    def test_reads_non_ascii_and_crlf(self, tmp_path):
+        path = tmp_path / "manifest.ndjson"
+        path.write_bytes('{"reason": "caf\u00e9 \u2014 ok"}\r\n{"reason": "x"}\r\n'.encode("utf-8"))
+
+        records = read_manifest(path)
+
+        assert [r["reason"] for r in records] == ["caf\u00e9 \u2014 ok", "x"]
+
+    def test_rereads_after_append(self, tmp_path):
+        path = tmp_path / "manifest.ndjson"
+        append_decision_manifest(path, DecisionEvent.create("parent_0", ["a"]), "sess")
+        assert len(read_manifest(path)) == 1
+
+        append_decision_manifest(path, DecisionEvent.create("parent_1", ["b"]), "sess")
+
+        assert [r["parent_node_id"] for r in read_manifest(path)] == ["parent_0", "parent_1"]
+
+    def test_repeated_reads_return_independent_records(self, tmp_path):
+        path = tmp_path / "manifest.ndjson"
+        append_decision_manifest(path, DecisionEvent.create("parent", ["a"]), "sess")
+
+        first = read_manifest(path)
+        first[0]["reason"] = "edited"
+        first[0]["candidate_node_ids"].append("x")
+        first.clear()
+
+        again = read_manifest(path)
+        assert again[0]["reason"] == ""
+        assert again[0]["candidate_node_ids"] == ["a"]
+
+    def test_clear_manifest_cache_forces_reparse(self, tmp_path, monkeypatch):
+        import loom.io.manifest as manifest_mod
+
+        path = tmp_path / "manifest.ndjson"
+        append_decision_manifest(path, DecisionEvent.create("parent", ["a"]), "sess")
+        read_manifest(path)
+        parsed = []
+        real_iter = manifest_mod.iter_manifest
+        monkeypatch.setattr(
+            manifest_mod, "iter_manifest", lambda p: parsed.append(p) or real_iter(p)
+        )
+
+        read_manifest(path)
+        assert parsed == []
+        manifest_mod.clear_manifest_cache()
+        read_manifest(path)
+        assert parsed == [str(path)]
+
+
+class TestIterManifest:
+    """Tests for iter_manifest."""
+
+    def test_yields_same_records_as_read_manifest(self, tmp_path):
+        path = tmp_path / "manifest.ndjson"
+        with ManifestWriter(path) as writer:
+            for i in range(3):
+                event = DecisionEvent.create(f"parent_{i}", [f"node_{i}"])
+                event.resolve_choose(f"node_{i}", "human", f"reason_{i}")
+                writer.append(event, session_id="sess")
+        with path.open("ab") as f:
+            f.write(b"\n")
+
+        assert list(iter_manifest(path)) == read_manifest(path)
+
+    def test_is_lazy(self, tmp_path):
+        path = tmp_path / "manifest.ndjson"
+        path.write_bytes(b'{"decision_id": "1"}\nnot json\n')
+
+        records = iter_manifest(path)
+
+        assert next(records) == {"decision_id": "1"}
+
+    def test_missing_file_yields_nothing(self, tmp_path):
+        assert list(iter_manifest(tmp_path / "nonexistent.ndjson")) == []
+
 
 class TestManifestIntegration:
     """Integration tests for manifest logging with Loom."""
@@ -204,3 +386,24 @@ class TestManifestIntegration:
         assert records[1]["session_id"] == loom.session_id
         assert records[1]["action"] == "choose"
         assert records[1]["reason"] == "second choice"
+
+
+class TestCompressManifest:
+    """Tests for compress_manifest and reading gzipped manifests."""
+
+    def test_compressed_manifest_reads_back_identically(self, tmp_path):
+        path = tmp_path / "manifest.ndjson"
+        events = [DecisionEvent.create(f"parent_{i}", [f"n{i}"]) for i in range(20)]
+        append_decision_manifest_batch(path, events, session_id="sess")
+        expected = read_manifest(path)
+
+        gz_path = compress_manifest(path)
+
+        assert gz_path == tmp_path / "manifest.ndjson.gz"
+        assert not path.exists()
+        assert gz_path.stat().st_size < len(b"".join(json.dumps(r).encode() for r in expected))
+        assert read_manifest(gz_path) == expected
+        assert list(iter_manifest(str(gz_path))) == expected
+
+    def test_missing_compressed_manifest_reads_empty(self, tmp_path):
+        assert read_manifest(tmp_path / "manifest.ndjson.gz") == []
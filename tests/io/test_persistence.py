@@ -5,6 +5,7 @@ import pytest
 from pathlib import Path
 
 from loom.core.models import Loom, Node
+from loom.io import jsonutil
 from loom.io.persistence import save_loom, load_loom
 
 
@@ -47,6 +48,49 @@ class TestSaveLoom:
 
         assert Path(path).exists()
 
+    def test_streamed_json_matches_to_dict(self, tmp_path):
+        loom = Loom.create("The ", brief='brief with "quotes"\nand newline')
+        root = loom.get_tip()
+        candidates = [
+            Node.from_candidate(root, "quick", [1], token_logprobs=[-0.5], step_logprob=-0.5),
+            Node.from_candidate(root, "sl\u00f6w", [2]),
+        ]
+        event = loom.add_candidates(root.id, candidates)
+        loom.commit_choice(event.id, candidates[0].id, "human", "ok")
+        path = tmp_path / "loom.json"
+
+        save_loom(loom, path)
+
+        with path.open() as f:
+            data = json.load(f)
+        assert data == json.loads(json.dumps(loom.to_dict()))
+
+    def test_empty_loom_writes_valid_json(self, tmp_path):
+        path = tmp_path / "loom.json"
+
+        save_loom(Loom(), path)
+
+        with path.open() as f:
+            data = json.load(f)
+        assert data["nodes"] == {}
+        assert data["decision_events"] == {}
+
+    def test_replaces_existing_file_atomically(self, tmp_path, monkeypatch):
+        path = tmp_path / "loom.json"
+        old = Loom.create(seed_text="Old", brief="")
+        save_loom(old, path)
+
+        def fail(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr("loom.io.persistence.os.replace", fail)
+        with pytest.raises(OSError):
+            save_loom(Loom.create(seed_text="New", brief=""), path)
+
+        # The previous file is untouched and no temporary file is left behind
+        assert load_loom(path).session_id == old.session_id
+        assert [p.name for p in tmp_path.iterdir()] == ["loom.json"]
+
 
 class TestLoadLoom:
     """Tests for load_loom."""
@@ -70,6 +114,13 @@ class TestLoadLoom:
 
         assert loaded.session_id == loom.session_id
 
+    def test_empty_file_raises_decode_error(self, tmp_path):
+        path = tmp_path / "loom.json"
+        path.write_bytes(b"")
+
+        with pytest.raises(ValueError):
+            load_loom(path)
+
 
 class TestRoundTrip:
     """Tests for save/load round-trip integrity."""
@@ -162,7 +213,7 @@ class TestRoundTrip:
 
         loaded_node = loaded.nodes[candidate.id]
         assert loaded_node.step_logprob == -3.0
-        assert loaded_node.token_logprobs == [-1.0, -2.0]
+        assert loaded_node.token_logprobs.tolist() == [-1.0, -2.0]
 
     def test_json_structure_matches_spec(self, tmp_path):
         """JSON output should have expected top-level keys."""
@@ -183,3 +234,24 @@ class TestRoundTrip:
         assert "created_at" in data
         assert "nodes" in data
         assert "decision_events" in data
+
+
+@pytest.mark.parametrize("backend", ["orjson", "stdlib"])
+def test_roundtrip_is_identical_across_json_backends(tmp_path, monkeypatch, backend):
+    if backend == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(jsonutil, "orjson", None)
+    loom = Loom.create("Caf\u00e9 ", brief="b")
+    root = loom.get_tip()
+    candidate = Node.from_candidate(
+        root, " na\u00efve", [1, 2], token_logprobs=[-0.1, -1e-12], step_logprob=-0.1
+    )
+    event = loom.add_candidates(root.id, [candidate])
+    loom.commit_choice(event.id, candidate.id, "human", "ok")
+    path = tmp_path / "loom.json"
+
+    save_loom(loom, path)
+
+    assert json.loads(path.read_text("utf-8")) == json.loads(json.dumps(loom.to_dict()))
+    assert load_loom(path).to_dict() == loom.to_dict()
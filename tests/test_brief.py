@@ -67,3 +67,22 @@ def test_load_markdown_fallback(tmp_path: Path):
     assert brief.title == ""
     assert brief.section_intent == ""
 
+
+def test_load_toml_repeated_loads_return_independent_briefs(tmp_path: Path):
+    path = tmp_path / "brief.toml"
+    path.write_text('lean_into = ["aliveness"]\n', encoding="utf-8")
+
+    first = load_brief(path)
+    first.lean_into.append("mutated")
+    second = load_brief(path)
+
+    assert second.lean_into == ["aliveness"]
+
+
+def test_load_toml_picks_up_changed_content(tmp_path: Path):
+    path = tmp_path / "brief.toml"
+    path.write_text('title = "One"\n', encoding="utf-8")
+    assert load_brief(path).title == "One"
+
+    path.write_text('title = "Two"\n', encoding="utf-8")
+    assert load_brief(path).title == "Two"
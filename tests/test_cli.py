@@ -1,6 +1,9 @@
 """Basic tests for the CLI using FakeGenerator and patched input."""
 
 import builtins
+import subprocess
+import sys
+import time
 import types
 from pathlib import Path
 
@@ -8,24 +11,30 @@ import pytest
 
 import loom.cli as cli
 from loom.generators.fake import FakeGenerator
+from loom.io.journal import replay_journal
 from loom.io.persistence import load_loom
 
 
 class _StubConsole:
-    """Minimal console stub capturing prompts; prints are no-ops."""
+    """Minimal console stub; prints are captured and otherwise ignored."""
 
-    def __init__(self, inputs):
-        self.inputs = inputs
+    def __init__(self):
         self.output = []
 
     def print(self, *args, **kwargs):
         # capture but ignore
         self.output.append((args, kwargs))
 
-    def input(self, prompt: str):
-        if not self.inputs:
+
+def _stub_inputs(monkeypatch, inputs):
+    """Feed `inputs` to the CLI prompt via builtins.input."""
+
+    def fake_input(prompt=""):
+        if not inputs:
             raise EOFError("No more inputs")
-        return self.inputs.pop(0)
+        return inputs.pop(0)
+
+    monkeypatch.setattr(builtins, "input", fake_input)
 
 
 def test_cli_happy_path(monkeypatch, tmp_path, capsys):
@@ -37,12 +46,13 @@ def test_cli_happy_path(monkeypatch, tmp_path, capsys):
     fake_gen = FakeGenerator(prefix="opt_", step_logprob=None)
     monkeypatch.setattr(cli, "make_generator", lambda cfg, client: fake_gen)
 
-    # Patch Console to use stubbed inputs: choose first candidate, then stop
-    stub_console = _StubConsole(inputs=["1", "s"])
-    monkeypatch.setattr(cli, "Console", lambda: stub_console)
+    # Stub the console and feed inputs: choose first candidate, then stop
+    console = _StubConsole()
+    monkeypatch.setattr(cli, "make_console", lambda: console)
+    _stub_inputs(monkeypatch, ["1", "s"])
 
     # Patch anthropic client creation to avoid network
-    monkeypatch.setattr(cli.anthropic, "Anthropic", lambda: types.SimpleNamespace())
+    monkeypatch.setattr(cli, "make_client", lambda cfg: types.SimpleNamespace())
 
     output_dir = tmp_path / "out"
     argv = [
@@ -70,10 +80,151 @@ def test_cli_happy_path(monkeypatch, tmp_path, capsys):
     # Path should include root + one chosen node
     assert len(loaded.current_path) == 2
 
+    # Each candidate was printed as it arrived, before its table
+    arrivals = [args[0] for args, kwargs in console.output if kwargs.get("markup") is False]
+    assert arrivals == ["opt_0", "opt_1", "opt_0", "opt_1"]
+
+    # The per-step journal replays to the same session as the final snapshot
+    replayed = replay_journal(output_dir / "journal.ndjson")
+    assert replayed.to_dict() == loaded.to_dict()
+
 
 def test_cli_requires_brief(monkeypatch, tmp_path):
     # Patch Console to prevent actual IO
-    monkeypatch.setattr(cli, "Console", lambda: _StubConsole(inputs=[]))
+    monkeypatch.setattr(cli, "make_console", _StubConsole)
+    _stub_inputs(monkeypatch, [])
     with pytest.raises(SystemExit):
         cli.main(["--seed", "Hi"])
 
+
+# Runs a --speculate session with the real ClaudeCLISimGenerator: the first
+# step's n=3 requests return at once, every later (speculative) request blocks
+# for a minute. The prompt only returns "q" once a speculative request is in
+# flight, so the process exits promptly only if nothing joins those threads.
+_SPECULATE_QUIT_SCRIPT = """
+import builtins, sys, threading, types
+import loom.cli as cli
+
+started = threading.Event()
+calls = []
+
+def create(**kwargs):
+    calls.append(kwargs)
+    if len(calls) > 3:
+        started.set()
+        threading.Event().wait(60)
+    return types.SimpleNamespace(content=[types.SimpleNamespace(text="opt")])
+
+def fake_input(prompt=""):
+    assert started.wait(10), "speculation never started"
+    return "q"
+
+cli.make_client = lambda cfg: types.SimpleNamespace(messages=types.SimpleNamespace(create=create))
+builtins.input = fake_input
+cli.main(sys.argv[1:])
+"""
+
+
+def test_cli_speculate_quit_does_not_wait_for_speculation(tmp_path):
+    brief_path = tmp_path / "brief.toml"
+    brief_path.write_text('section_intent = "Test intent"\n', encoding="utf-8")
+    output_dir = tmp_path / "out"
+
+    start = time.monotonic()
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            _SPECULATE_QUIT_SCRIPT,
+            "--seed",
+            "Hello ",
+            "--brief-path",
+            str(brief_path),
+            "--output-dir",
+            str(output_dir),
+            "--branching-factor",
+            "3",
+            "--speculate",
+        ],
+        capture_output=True,
+        check=True,
+        timeout=30,
+    )
+
+    assert time.monotonic() - start < 20
+    assert load_loom(output_dir / "loom.json").get_current_text() == "Hello "
+
+
+def test_cli_import_does_not_load_heavy_deps():
+    code = "import sys, loom.cli; print(sorted({'anthropic', 'rich'} & set(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def _run_session(monkeypatch, tmp_path, inputs):
+    brief_path = tmp_path / "brief.toml"
+    brief_path.write_text('section_intent = "Test intent"\n', encoding="utf-8")
+    monkeypatch.setattr(
+        cli, "make_generator", lambda cfg, client: FakeGenerator(prefix="opt_")
+    )
+    monkeypatch.setattr(cli, "make_console", _StubConsole)
+    monkeypatch.setattr(cli, "make_client", lambda cfg: types.SimpleNamespace())
+    _stub_inputs(monkeypatch, inputs)
+    output_dir = tmp_path / "out"
+    cli.main(["--seed", "Hello ", "--brief-path", str(brief_path), "--output-dir", str(output_dir)])
+    return output_dir
+
+
+@pytest.mark.parametrize("ending", [["q"], []])  # quit, or input fails (Ctrl-D/crash)
+def test_cli_saves_loom_on_any_exit(monkeypatch, tmp_path, ending):
+    if ending:
+        output_dir = _run_session(monkeypatch, tmp_path, ["1"] + ending)
+    else:
+        with pytest.raises(EOFError):
+            _run_session(monkeypatch, tmp_path, ["1"])
+        output_dir = tmp_path / "out"
+
+    loaded = load_loom(output_dir / "loom.json")
+    assert loaded.get_current_text() == "Hello opt_0"
+
+
+def test_cli_snapshots_journal_periodically(monkeypatch, tmp_path):
+    monkeypatch.setattr(cli, "JOURNAL_SNAPSHOT_EVERY", 2)
+
+    output_dir = _run_session(monkeypatch, tmp_path, ["1", "1", "1", "1", "s"])
+
+    lines = (output_dir / "journal.ndjson").read_bytes().splitlines()
+    assert sum(b'"op":"snapshot"' in line for line in lines) == 3  # start + 2 periodic
+    assert replay_journal(output_dir / "journal.ndjson").to_dict() == load_loom(
+        output_dir / "loom.json"
+    ).to_dict()
+
+
+def test_cli_batches_manifest_flushes_but_not_journal_flushes(monkeypatch, tmp_path):
+    writers = {}
+
+    class _RecordingManifest(cli.ManifestWriter):
+        def __init__(self, path, **kwargs):
+            super().__init__(path, **kwargs)
+            writers["manifest"] = self
+
+    class _RecordingJournal(cli.JournalWriter):
+        def __init__(self, path, **kwargs):
+            super().__init__(path, **kwargs)
+            writers["journal"] = self
+
+    monkeypatch.setattr(cli, "ManifestWriter", _RecordingManifest)
+    monkeypatch.setattr(cli, "JournalWriter", _RecordingJournal)
+
+    _run_session(monkeypatch, tmp_path, ["1", "s"])
+
+    assert writers["manifest"].flush_every == cli.MANIFEST_FLUSH_EVERY > 1
+    assert writers["journal"].flush_every == 1
+
+
+def test_cli_help_says_quit_saves(capsys):
+    with pytest.raises(SystemExit):
+        cli.parse_args(["--help"])
+
+    help_text = " ".join(capsys.readouterr().out.split())
+    assert "loom.json is written whenever the session ends (s=stop, q=quit" in help_text
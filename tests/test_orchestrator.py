@@ -1,10 +1,16 @@
 """Tests for the Orchestrator."""
 
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
 from loom.brief import Brief
 from loom.core.config import SessionConfig, BaseEngineConfig
 from loom.core.models import Loom
 from loom.generators.fake import FakeGenerator
-from loom.orchestrator import Orchestrator
+from loom.io.journal import JournalWriter, replay_journal
+from loom.io.manifest import ManifestWriter, read_manifest
+from loom.orchestrator import AsyncOrchestrator, Orchestrator
 
 
 def make_session_config(branching: int = 2, segment_tokens: int = 6) -> SessionConfig:
@@ -60,3 +66,281 @@ def test_commit_stop_does_not_extend_path():
 
     assert loom.current_path == [loom.root_id]
     assert event.action == "stop"
+
+
+class _RecordingGenerator(FakeGenerator):
+    """FakeGenerator that records the full_text of every call."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = []
+
+    def generate_candidates(self, *, full_text, **kwargs):
+        self.calls.append(full_text)
+        return super().generate_candidates(full_text=full_text, **kwargs)
+
+
+def test_speculation_reused_when_likeliest_candidate_chosen():
+    loom = Loom.create("Seed ", brief="")
+    gen = _RecordingGenerator(prefix="c")
+    orch = Orchestrator(loom, gen, Brief(), make_session_config(branching=2))
+
+    event = orch.generate_step()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        speculated = orch.speculate(event, pool)
+        assert speculated == event.candidate_node_ids[0]  # no logprobs: first
+        orch.commit_choice(event.id, speculated, reason="pick")
+        next_event = orch.generate_step()
+
+    assert gen.calls == ["Seed ", "Seed c0"]  # no third call
+    assert next_event.parent_node_id == speculated
+    assert len(next_event.candidate_node_ids) == 2
+
+
+def test_speculation_discarded_when_other_candidate_chosen():
+    loom = Loom.create("Seed ", brief="")
+    gen = _RecordingGenerator(prefix="c")
+    orch = Orchestrator(loom, gen, Brief(), make_session_config(branching=2))
+
+    event = orch.generate_step()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        orch.speculate(event, pool)
+        orch.commit_choice(event.id, event.candidate_node_ids[1], reason="other")
+        orch.generate_step()
+
+    assert gen.calls[-1] == "Seed c1"
+
+
+def test_speculation_prefers_highest_logprob():
+    loom = Loom.create("Seed ", brief="")
+    orch = Orchestrator(loom, FakeGenerator(), Brief(), make_session_config(branching=3))
+    event = orch.generate_step()
+    for nid, lp in zip(event.candidate_node_ids, [-2.0, -0.5, None]):
+        loom.nodes[nid].step_logprob = lp
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        assert orch.speculate(event, pool) == event.candidate_node_ids[1]
+        orch.commit_stop(event.id, "done")
+
+
+def test_generate_step_passes_each_candidate_to_on_candidate():
+    loom = Loom.create("Seed ", brief="")
+    orch = Orchestrator(loom, FakeGenerator(prefix="c"), Brief(), make_session_config(branching=3))
+
+    arrived = []
+    event = orch.generate_step(on_candidate=lambda cand: arrived.append(cand.text))
+
+    assert arrived == ["c0", "c1", "c2"]
+    assert [loom.nodes[n].text for n in event.candidate_node_ids] == arrived
+
+
+def test_generate_step_passes_speculated_candidates_to_on_candidate():
+    loom = Loom.create("Seed ", brief="")
+    gen = _RecordingGenerator(prefix="c")
+    orch = Orchestrator(loom, gen, Brief(), make_session_config(branching=2))
+
+    event = orch.generate_step()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        speculated = orch.speculate(event, pool)
+        orch.commit_choice(event.id, speculated, reason="pick")
+        arrived = []
+        orch.generate_step(on_candidate=lambda cand: arrived.append(cand.text))
+
+    assert gen.calls == ["Seed ", "Seed c0"]
+    assert arrived == ["c0", "c1"]
+
+
+class _MultiRecordingGenerator(FakeGenerator):
+    """FakeGenerator that records each generate_candidates_multi call."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.multi_calls = []
+
+    def generate_candidates_multi(self, *, contexts, n, max_tokens):
+        self.multi_calls.append([ctx.full_text for ctx in contexts])
+        return super().generate_candidates_multi(contexts=contexts, n=n, max_tokens=max_tokens)
+
+
+class _FailingSpeculationExecutor:
+    """Executor whose futures fail like a rate-limited request."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_exception(RuntimeError("429 Too Many Requests"))
+        return future
+
+
+def test_failed_speculation_falls_back_to_fresh_generation():
+    loom = Loom.create("Seed ", brief="")
+    gen = _RecordingGenerator(prefix="c")
+    orch = Orchestrator(loom, gen, Brief(), make_session_config(branching=2))
+
+    event = orch.generate_step()
+    speculated = orch.speculate(event, _FailingSpeculationExecutor())
+    orch.commit_choice(event.id, speculated, reason="pick")
+    next_event = orch.generate_step()
+
+    assert gen.calls == ["Seed ", "Seed c0"]  # the failed pre-fetch never reached gen
+    assert next_event.parent_node_id == speculated
+    assert [loom.nodes[n].text for n in next_event.candidate_node_ids] == ["c0", "c1"]
+
+
+def test_failed_speculation_falls_back_in_generate_steps():
+    loom = Loom.create("Seed ", brief="")
+    gen = _MultiRecordingGenerator(prefix="c")
+    orch = Orchestrator(loom, gen, Brief(), make_session_config(branching=2))
+
+    event = orch.generate_step()
+    speculated = orch.speculate(event, _FailingSpeculationExecutor())
+    orch.commit_choice(event.id, speculated, reason="pick")
+    events = orch.generate_steps()
+
+    assert gen.multi_calls == [["Seed c0"]]
+    assert [e.parent_node_id for e in events] == [speculated]
+    assert len(events[0].candidate_node_ids) == 2
+
+
+def test_failed_speculation_falls_back_in_generate_step_async():
+    loom = Loom.create("Seed ", brief="")
+    gen = _RecordingGenerator(prefix="c")
+    orch = AsyncOrchestrator(loom, gen, Brief(), make_session_config(branching=2))
+
+    event = asyncio.run(orch.generate_step_async())
+    speculated = orch.speculate(event, _FailingSpeculationExecutor())
+    orch.commit_choice(event.id, speculated, reason="pick")
+    next_event = asyncio.run(orch.generate_step_async())
+
+    assert gen.calls == ["Seed ", "Seed c0"]
+    assert len(next_event.candidate_node_ids) == 2
+
+
+def test_generate_steps_extends_current_and_held_paths_in_one_call():
+    loom = Loom.create("Seed ", brief="")
+    gen = _MultiRecordingGenerator(prefix="c")
+    orch = Orchestrator(loom, gen, Brief(section_intent="Intent"), make_session_config(branching=2))
+
+    first = orch.generate_step()
+    a, b = first.candidate_node_ids
+    orch.commit_choice(first.id, a, reason="pick")
+    loom.held_paths.append([loom.root_id, b])
+    loom.held_paths.append([loom.root_id, b])  # duplicate tip is generated once
+
+    events = orch.generate_steps()
+
+    assert gen.multi_calls == [["Seed c0", "Seed c1"]]
+    assert [e.parent_node_id for e in events] == [a, b]
+    assert all(len(e.candidate_node_ids) == 2 for e in events)
+
+
+def test_commit_choice_on_held_path_event_extends_that_path(tmp_path):
+    loom = Loom.create("Seed ", brief="")
+    path = tmp_path / "journal.ndjson"
+    with JournalWriter(path) as journal:
+        journal.snapshot(loom)
+        orch = Orchestrator(
+            loom, FakeGenerator(prefix="c"), Brief(), make_session_config(), journal=journal
+        )
+        first = orch.generate_step()
+        a, b = first.candidate_node_ids
+        orch.commit_choice(first.id, a, reason="pick")
+        loom.held_paths.append([loom.root_id, b])
+        journal.snapshot(loom)  # held_paths edits are not journaled
+
+        current_event, held_event = orch.generate_steps()
+        orch.commit_choice(held_event.id, held_event.candidate_node_ids[0], reason="held")
+        orch.commit_choice(current_event.id, current_event.candidate_node_ids[1], reason="cur")
+
+    assert loom.get_current_text() == "Seed c0c1"
+    assert loom.get_full_text(loom.held_paths[0][-1]) == "Seed c1c0"
+    assert loom.held_paths[0] == [loom.root_id, b, held_event.candidate_node_ids[0]]
+    assert replay_journal(path).to_dict() == loom.to_dict()
+
+
+def test_generate_steps_reuses_speculation_for_current_tip():
+    loom = Loom.create("Seed ", brief="")
+    gen = _MultiRecordingGenerator(prefix="c")
+    orch = Orchestrator(loom, gen, Brief(), make_session_config(branching=2))
+
+    event = orch.generate_step()
+    a, b = event.candidate_node_ids
+    loom.held_paths.append([loom.root_id, b])
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        orch.speculate(event, pool)
+        orch.commit_choice(event.id, a, reason="pick")
+        events = orch.generate_steps()
+
+    assert gen.multi_calls == [["Seed c1"]]
+    assert [e.parent_node_id for e in events] == [a, b]
+
+
+def test_orchestrator_journals_each_change(tmp_path):
+    loom = Loom.create("Seed ", brief="")
+    path = tmp_path / "journal.ndjson"
+    with JournalWriter(path) as journal:
+        journal.snapshot(loom)
+        orch = Orchestrator(
+            loom, FakeGenerator(prefix="c"), Brief(), make_session_config(), journal=journal
+        )
+        event = orch.generate_step()
+        orch.commit_choice(event.id, event.candidate_node_ids[0], reason="pick")
+        event = orch.generate_step()
+        orch.commit_stop(event.id, "done")
+
+    assert replay_journal(path).to_dict() == loom.to_dict()
+
+
+def test_orchestrator_logs_resolved_decisions_to_manifest(tmp_path):
+    loom = Loom.create("Seed ", brief="")
+    path = tmp_path / "manifest.ndjson"
+    with ManifestWriter(path) as manifest:
+        orch = Orchestrator(
+            loom, FakeGenerator(prefix="c"), Brief(), make_session_config(), manifest=manifest
+        )
+        first = orch.generate_step()
+        orch.commit_choice(first.id, first.candidate_node_ids[0], reason="pick")
+        second = orch.generate_step()
+        orch.commit_stop(second.id, "done")
+
+    records = read_manifest(path)
+    assert [r["decision_id"] for r in records] == [first.id, second.id]
+    assert [r["action"] for r in records] == ["choose", "stop"]
+    assert all(r["session_id"] == loom.session_id for r in records)
+
+
+def test_async_generate_step_lets_other_tasks_run():
+    other_task_ran = threading.Event()
+
+    class _WaitingGenerator(FakeGenerator):
+        def generate_candidates(self, **kwargs):
+            # Only returns if the event loop kept running other tasks meanwhile
+            assert other_task_ran.wait(timeout=5)
+            return super().generate_candidates(**kwargs)
+
+    loom = Loom.create("Seed ", brief="")
+    orch = AsyncOrchestrator(loom, _WaitingGenerator(prefix="c"), Brief(), make_session_config())
+
+    async def other_task():
+        other_task_ran.set()
+
+    async def main():
+        event, _ = await asyncio.gather(orch.generate_step_async(), other_task())
+        return event
+
+    event = asyncio.run(main())
+    assert [loom.nodes[n].text for n in event.candidate_node_ids] == ["c0", "c1"]
+
+
+def test_async_generate_step_reuses_speculation():
+    loom = Loom.create("Seed ", brief="")
+    gen = _RecordingGenerator(prefix="c")
+    orch = AsyncOrchestrator(loom, gen, Brief(), make_session_config(branching=2))
+
+    event = asyncio.run(orch.generate_step_async())
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        speculated = orch.speculate(event, pool)
+        orch.commit_choice(event.id, speculated, reason="pick")
+        next_event = asyncio.run(orch.generate_step_async())
+
+    assert gen.calls == ["Seed ", "Seed c0"]
+    assert next_event.parent_node_id == speculated